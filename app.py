@@ -1,912 +1,1881 @@
 from dotenv import load_dotenv
 import os
+import abc
+import logging
 import time
+import random
+import threading
+import socket
+import hashlib
+import tempfile
+import sqlite3
+import statistics
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from collections import namedtuple, deque
 import requests
 import streamlit as st
-from googleapiclient.discovery import build
-from google.cloud import storage
-import google.generativeai as genai
-import matplotlib.pyplot as plt
-import numpy as np
-from fpdf import FPDF
 from io import BytesIO
 import re
-import plotly.express as px
-import plotly.graph_objects as go
 from datetime import datetime
 import json
-from google.oauth2.service_account import Credentials
+from itertools import islice
 
+import sentiment_engine
+from errors import AnalysisFailedError, AnalysisQuotaError, AnalysisSubmitError, CredentialsError
 
-# ─── Load .env & configure Gemini ─────────────────────────────────────────────
+logger = logging.getLogger(__name__)
+
+# Heavy SDKs (googleapiclient, google-cloud-storage, google-generativeai, plotly,
+# fpdf) are imported inside the functions that use them: Streamlit re-executes
+# this script on every rerun and those imports dominate cold container starts.
+
+
+# ─── Load .env & check configuration ─────────────────────────────────────────
 load_dotenv()
 gemini_key = st.secrets.get("GEMINI_API_KEY", os.getenv("GEMINI_API_KEY"))
 if not gemini_key:
     st.error("🔑 Gemini API key missing. Set GEMINI_API_KEY in .env or Streamlit secrets.")
     st.stop()
-genai.configure(api_key=gemini_key)
-import json
-from google.cloud import storage
-from google.oauth2.service_account import Credentials
 
 # Always get the full JSON string from Streamlit secrets (or fallback to env, which should also be a JSON string)
 creds_json = st.secrets.get("GOOGLE_APPLICATION_CREDENTIALS", os.getenv("GOOGLE_APPLICATION_CREDENTIALS"))
 
-# Debug: show a portion of your secret (optional, remove in production)
-print("Loaded GOOGLE_APPLICATION_CREDENTIALS (first 100 chars):", repr(creds_json)[:100])
-
 if not creds_json:
     st.error("❌ GOOGLE_APPLICATION_CREDENTIALS missing in Streamlit secrets or environment variable.")
     st.stop()
 
-# Parse the JSON string into a dictionary
-try:
-    # If somehow the value is already a dict (rare), use as is
-    creds_dict = creds_json if isinstance(creds_json, dict) else json.loads(creds_json)
-except Exception as e:
-    st.error(f"❌ Failed to parse GOOGLE_APPLICATION_CREDENTIALS as JSON: {e}")
-    st.stop()
+@st.cache_resource(show_spinner=False)
+def get_google_credentials():
+    """Parse the service account once per process; returns (credentials, project)
 
-# Create credentials and client explicitly by passing the credentials object
-try:
-    google_creds = Credentials.from_service_account_info(creds_dict)
-    google_project = creds_dict["project_id"]  # or st.secrets["GOOGLE_CLOUD_PROJECT"]
-    st.session_state['google_creds'] = google_creds
-    st.session_state['google_project'] = google_project
-except Exception as e:
-    st.error(f"❌ Failed to create Google Cloud Storage client: {e}")
-    st.stop()
+    Raises CredentialsError when the secret is malformed; callers surface it
+    the first time GCS or Pub/Sub is used.
+    """
+    from google.oauth2.service_account import Credentials
+
+    # Parse the JSON string into a dictionary; if somehow the value is already a dict (rare), use as is
+    try:
+        creds_dict = creds_json if isinstance(creds_json, dict) else json.loads(creds_json)
+    except Exception as e:
+        raise CredentialsError(f"Failed to parse GOOGLE_APPLICATION_CREDENTIALS as JSON: {e}") from e
+
+    try:
+        google_creds = Credentials.from_service_account_info(creds_dict)
+        google_project = creds_dict["project_id"]  # or st.secrets["GOOGLE_CLOUD_PROJECT"]
+    except Exception as e:
+        raise CredentialsError(f"Failed to load Google service account credentials: {e}") from e
+    return google_creds, google_project
+
+@st.cache_resource
+def get_gemini():
+    """google.generativeai, imported and configured on first use"""
+    import google.generativeai as genai
+
+    genai.configure(api_key=gemini_key)
+    return genai
 
 # ─── Streamlit page setup ─────────────────────────────────────────────────────
 st.set_page_config(page_title="YouTube Sentiment Dashboard", page_icon="🎬", layout="wide")
 
-# ─── Enhanced Custom CSS ─────────────────────────────────────────────────────
-st.markdown("""
-<style>
-  @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700;800&display=swap');
-  
-  /* Global Styles */
-  html, body, [class*="st-"] { 
-    font-family: 'Inter', sans-serif !important; 
-  }
-  
-  .main > div {
-    padding-top: 2rem;
-  }
-  
-  /* Remove white bars/containers */
-  .main .block-container {
-    padding-top: 1rem;
-    padding-bottom: 1rem;
-  }
-  
-  /* Hide default streamlit header/footer */
-  header[data-testid="stHeader"] {
-    display: none !important;
-  }
-  
-  .stApp > header {
-    display: none !important;
-  }
-  
-  /* Remove default streamlit margins */
-  .main .block-container {
-    max-width: 100%;
-    padding-left: 2rem;
-    padding-right: 2rem;
-  }
-  
-  /* Background */
-  .stApp {
-    background: linear-gradient(135deg, #667eea 0%, #764ba2 50%, #f093fb 100%);
-    background-attachment: fixed;
-  }
-  
-/* Header Styles */
-.main-header { 
-    background: linear-gradient(135deg, 
-        rgba(15,15,35,0.95) 0%, 
-        rgba(25,25,55,0.98) 25%,
-        rgba(35,15,45,0.95) 50%,
-        rgba(20,20,40,0.92) 100%);
-    backdrop-filter: blur(25px);
-    border-radius: 25px;
-    padding: 40px;
-    margin-bottom: 30px;
-    box-shadow: 
-        0 25px 50px rgba(0,0,0,0.3),
-        0 0 0 1px rgba(100,200,255,0.3),
-        inset 0 1px 0 rgba(255,255,255,0.2),
-        0 0 60px rgba(0,150,255,0.15);
-    border: 2px solid rgba(100,200,255,0.4);
-    display: flex;
-    align-items: center;
-    gap: 30px;
-    animation: slideInDown 0.8s ease-out, headerPulse 3s ease-in-out infinite;
-    position: relative;
-    overflow: hidden;
-}
+# ─── Theme ───────────────────────────────────────────────────────────────────
+THEME_CSS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static", "theme.css")
 
-/* Animated background with AI-themed colors */
-.main-header::before {
-    content: '';
-    position: absolute;
-    top: -50%;
-    left: -50%;
-    width: 200%;
-    height: 200%;
-    background: 
-        radial-gradient(circle at 25% 25%, rgba(0,200,255,0.08) 0%, transparent 50%),
-        radial-gradient(circle at 75% 75%, rgba(150,0,255,0.06) 0%, transparent 50%),
-        radial-gradient(circle at 50% 10%, rgba(255,0,150,0.04) 0%, transparent 60%);
-    animation: aiParticles 15s linear infinite;
-    pointer-events: none;
-    z-index: 1;
-}
+@st.cache_resource
+def load_theme_css():
+    """Theme stylesheet and its content hash, read once per process"""
+    with open(THEME_CSS_PATH, encoding="utf-8") as f:
+        css = f.read()
+    return css, hashlib.sha256(css.encode("utf-8")).hexdigest()[:16]
 
-/* Floating neural network effect */
-.main-header::after {
-    content: '';
-    position: absolute;
-    top: 0;
-    left: 0;
-    right: 0;
-    bottom: 0;
-    background-image: 
-        radial-gradient(circle at 20% 30%, rgba(0,255,200,0.1) 2px, transparent 2px),
-        radial-gradient(circle at 80% 20%, rgba(255,0,200,0.1) 1px, transparent 1px),
-        radial-gradient(circle at 60% 80%, rgba(100,200,255,0.1) 1.5px, transparent 1.5px),
-        radial-gradient(circle at 30% 70%, rgba(200,100,255,0.1) 1px, transparent 1px);
-    background-size: 100px 100px, 80px 80px, 120px 120px, 90px 90px;
-    animation: neuralNetwork 8s ease-in-out infinite;
-    pointer-events: none;
-    z-index: 2;
-}
+def inject_theme():
+    """Install the theme stylesheet once per browser session.
 
-/* Enhanced title styling */
-.main-header h1 {
-    position: relative;
-    z-index: 3;
-    background: linear-gradient(45deg, 
-        #00d4ff 0%, 
-        #ff0080 25%, 
-        #8000ff 50%, 
-        #00ff80 75%, 
-        #ff4000 100%);
-    background-size: 300% 300%;
-    -webkit-background-clip: text;
-    -webkit-text-fill-color: transparent;
-    background-clip: text;
-    animation: gradientShift 4s ease-in-out infinite;
-    font-weight: 700;
-    text-shadow: 0 0 30px rgba(0,200,255,0.3);
-}
+    The stylesheet is added to the parent document's <head> under an id derived
+    from its content hash, so it outlives the script run that added it and later
+    reruns send nothing. A changed stylesheet gets a new id and replaces the old one.
+    """
+    css, digest = load_theme_css()
+    if st.session_state.get("theme_hash") == digest:
+        return
+    
+    import streamlit.components.v1 as components
+
+    css_literal = json.dumps(css).replace("</", "<\\/")
+    components.html(f"""
+    <script>
+    const doc = window.parent.document;
+    const id = "yt-theme-{digest}";
+    if (!doc.getElementById(id)) {{
+        doc.querySelectorAll("style[data-yt-theme]").forEach((el) => el.remove());
+        const style = doc.createElement("style");
+        style.id = id;
+        style.dataset.ytTheme = "1";
+        style.textContent = {css_literal};
+        doc.head.appendChild(style);
+    }}
+    </script>
+    """, height=0)
+    st.session_state.theme_hash = digest
 
-/* AI Powered subtitle with enhanced effects */
-.ai-powered-text {
-    position: relative;
-    z-index: 3;
-    font-size: 1.2em;
-    font-weight: 600;
-    background: linear-gradient(90deg, 
-        #00ff88 0%,
-        #0088ff 25%,
-        #8800ff 50%,
-        #ff0088 75%,
-        #ff8800 100%);
-    background-size: 200% 100%;
-    -webkit-background-clip: text;
-    -webkit-text-fill-color: transparent;
-    background-clip: text;
-    animation: aiTextFlow 3s linear infinite;
-    text-transform: uppercase;
-    letter-spacing: 2px;
-    position: relative;
-}
+inject_theme()
 
-/* Glowing AI chip icon effect */
-.ai-powered-text::before {
-    content: '🧠';
-    position: absolute;
-    left: -30px;
-    top: 50%;
-    transform: translateY(-50%);
-    animation: brainPulse 2s ease-in-out infinite;
-    filter: drop-shadow(0 0 10px rgba(0,255,150,0.6));
-}
+# ─── Session state init ───────────────────────────────────────────────────────
+if "search_pager" not in st.session_state:
+    st.session_state.search_pager = None
+if "search_page" not in st.session_state:
+    st.session_state.search_page = 0
+if "selected_video" not in st.session_state:
+    st.session_state.selected_video = None
+if "raw_summary" not in st.session_state:
+    st.session_state.raw_summary = None
+if "ai_insights" not in st.session_state:
+    st.session_state.ai_insights = None
+if "analysis_result" not in st.session_state:
+    st.session_state.analysis_result = None  # sentiment_engine.SentimentResult of raw_summary
+if "result_error" not in st.session_state:
+    st.session_state.result_error = None  # why the last result could not be read
+if "analysis_status" not in st.session_state:
+    st.session_state.analysis_status = "idle"  # idle, submitting, processing, complete, error
+if "submission" not in st.session_state:
+    st.session_state.submission = None  # Submission handle while status is "submitting"
+if "analysis_notice" not in st.session_state:
+    st.session_state.analysis_notice = None  # (status class, message) shown while processing
+if "progress_samples" not in st.session_state:
+    st.session_state.progress_samples = []  # recent sentiment_engine.Progress of the running job
+if "notices" not in st.session_state:
+    st.session_state.notices = []  # Notice entries, dropped once expired
+if "analysis_error" not in st.session_state:
+    st.session_state.analysis_error = None  # why the analysis could not be started
+if "dashboard_mode" not in st.session_state:
+    st.session_state.dashboard_mode = False
+if "processing_stage" not in st.session_state:
+    st.session_state.processing_stage = ""
+if "analysis_start_time" not in st.session_state:
+    st.session_state.analysis_start_time = None
+if "analysis_owned" not in st.session_state:
+    st.session_state.analysis_owned = False  # this session claimed the run on display
+if "batch_selection" not in st.session_state:
+    st.session_state.batch_selection = {}  # video_id -> video, picked for batch analysis
+if "batch_jobs" not in st.session_state:
+    st.session_state.batch_jobs = []  # AnalysisQueue job IDs started from this session
+if "queue_mode" not in st.session_state:
+    st.session_state.queue_mode = False
+if "registry_synced_video" not in st.session_state:
+    st.session_state.registry_synced_video = None  # video last checked against the job registry
+if "chart_figures" not in st.session_state:
+    st.session_state.chart_figures = None  # (result key, figures) of the result on display
+if "reuse_check" not in st.session_state:
+    st.session_state.reuse_check = None  # ReuseCheck while a finished job's result is being vetted
+if "shared_result_at" not in st.session_state:
+    st.session_state.shared_result_at = None  # set when showing a result another run produced
+
+# ─── Caching ─────────────────────────────────────────────────────────────────
+CACHE_DB_PATH = st.secrets.get(
+    "CACHE_DB_PATH",
+    os.getenv("CACHE_DB_PATH", os.path.join(tempfile.gettempdir(), "yt-sentiment-cache.sqlite3")),
+)
+
+class SqliteCacheStore:
+    """Persistent tier shared by every cache namespace, values stored as JSON"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, expires_at REAL NOT NULL, "
+                "PRIMARY KEY (namespace, key))"
+            )
 
-/* Animated underline for AI text */
-.ai-powered-text::after {
-    content: '';
-    position: absolute;
-    bottom: -5px;
-    left: 0;
-    width: 100%;
-    height: 2px;
-    background: linear-gradient(90deg, 
-        transparent 0%,
-        #00ff88 20%,
-        #0088ff 40%,
-        #8800ff 60%,
-        #ff0088 80%,
-        transparent 100%);
-    animation: underlineGlow 2s ease-in-out infinite;
-}
+    def get(self, namespace, key):
+        """Return (value, expires_at) or None when missing or expired"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM cache WHERE namespace = ? AND key = ?", (namespace, key)
+            ).fetchone()
+        if row is None or row[1] < time.time():
+            return None
+        return json.loads(row[0]), row[1]
+
+    def set(self, namespace, key, value, expires_at):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+                (namespace, key, json.dumps(value), expires_at),
+            )
 
-/* Keyframe animations */
-@keyframes headerPulse {
-    0%, 100% { 
-        box-shadow: 
-            0 25px 50px rgba(0,0,0,0.3),
-            0 0 0 1px rgba(100,200,255,0.3),
-            inset 0 1px 0 rgba(255,255,255,0.2),
-            0 0 60px rgba(0,150,255,0.15);
-    }
-    50% { 
-        box-shadow: 
-            0 30px 60px rgba(0,0,0,0.4),
-            0 0 0 1px rgba(100,200,255,0.5),
-            inset 0 1px 0 rgba(255,255,255,0.3),
-            0 0 80px rgba(0,150,255,0.25);
-    }
-}
+    def purge_expired(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM cache WHERE expires_at < ?", (time.time(),))
 
-@keyframes aiParticles {
-    0% { transform: rotate(0deg) scale(1); opacity: 0.8; }
-    33% { transform: rotate(120deg) scale(1.1); opacity: 1; }
-    66% { transform: rotate(240deg) scale(0.9); opacity: 0.6; }
-    100% { transform: rotate(360deg) scale(1); opacity: 0.8; }
-}
+class TieredCache:
+    """In-memory LRU with a TTL in front of an optional SQLite tier.
 
-@keyframes neuralNetwork {
-    0%, 100% { 
-        background-position: 0% 0%, 100% 100%, 50% 50%, 25% 75%; 
-        opacity: 0.3;
-    }
-    50% { 
-        background-position: 100% 100%, 0% 0%, 75% 25%, 50% 50%; 
-        opacity: 0.6;
-    }
-}
+    Keys can be any JSON-serializable value and values must be JSON-serializable
+    so they survive the trip through the persistent tier. ``stats`` reports
+    hits per tier and misses for display in the UI.
+    """
 
-@keyframes gradientShift {
-    0%, 100% { background-position: 0% 50%; }
-    50% { background-position: 100% 50%; }
-}
+    def __init__(self, namespace, maxsize=256, ttl=3600, store=None):
+        self.namespace = namespace
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.store = store
+        self._lock = threading.Lock()
+        self._items = OrderedDict()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(key):
+        return json.dumps(key, sort_keys=True, separators=(",", ":"))
+
+    def _remember(self, key, value, expires_at):
+        self._items[key] = (expires_at, value)
+        self._items.move_to_end(key)
+        while len(self._items) > self.maxsize:
+            self._items.popitem(last=False)
+
+    def get(self, key, default=None):
+        key = self._key(key)
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None:
+                if item[0] >= time.time():
+                    self._items.move_to_end(key)
+                    self.memory_hits += 1
+                    return item[1]
+                del self._items[key]
+        
+        found = self.store.get(self.namespace, key) if self.store is not None else None
+        with self._lock:
+            if found is None:
+                self.misses += 1
+                return default
+            self.disk_hits += 1
+            self._remember(key, found[0], found[1])
+        return found[0]
+
+    def set(self, key, value):
+        key = self._key(key)
+        expires_at = time.time() + self.ttl
+        with self._lock:
+            self._remember(key, value, expires_at)
+        if self.store is not None:
+            self.store.set(self.namespace, key, value, expires_at)
+
+    def stats(self):
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": hits / lookups if lookups else 0.0,
+            }
 
-@keyframes aiTextFlow {
-    0% { background-position: 0% 50%; }
-    100% { background-position: 200% 50%; }
-}
+@st.cache_resource
+def get_cache_store():
+    """One SQLite cache database per process"""
+    store = SqliteCacheStore(CACHE_DB_PATH)
+    store.purge_expired()
+    return store
+
+@st.cache_resource
+def get_search_cache():
+    """YouTube search results, shared by every session on this server"""
+    ttl = int(st.secrets.get("SEARCH_CACHE_TTL", os.getenv("SEARCH_CACHE_TTL", str(6 * 3600))))
+    return TieredCache("search", maxsize=512, ttl=ttl, store=get_cache_store())
+
+# ─── YouTube API Client ──────────────────────────────────────────────────────
+@st.cache_resource
+def get_youtube_client(api_key):
+    """YouTube client built once per API key.
+
+    Uses the discovery document bundled with google-api-python-client, so
+    building never touches the network and works offline in tests.
+    """
+    from googleapiclient.discovery import build
 
-@keyframes brainPulse {
-    0%, 100% { 
-        transform: translateY(-50%) scale(1); 
-        filter: drop-shadow(0 0 10px rgba(0,255,150,0.6));
-    }
-    50% { 
-        transform: translateY(-50%) scale(1.2); 
-        filter: drop-shadow(0 0 20px rgba(0,255,150,0.9));
-    }
-}
+    return build("youtube", "v3", developerKey=api_key, static_discovery=True, cache_discovery=False)
 
-@keyframes underlineGlow {
-    0%, 100% { opacity: 0.6; transform: scaleX(1); }
-    50% { opacity: 1; transform: scaleX(1.05); }
-}
+@st.cache_resource
+def _youtube_connections():
+    """Per-thread persistent HTTP connections for YouTube API calls"""
+    return threading.local()
 
-@keyframes slideInDown {
-    from {
-        opacity: 0;
-        transform: translate3d(0, -100%, 0);
-    }
-    to {
-        opacity: 1;
-        transform: translate3d(0, 0, 0);
-    }
-}
+def youtube_execute(request, num_retries=2, connections=None):
+    """Execute a YouTube API request on the calling thread's own connection.
 
-/* Responsive adjustments */
-@media (max-width: 768px) {
-    .main-header {
-        padding: 25px;
-        gap: 20px;
-        flex-direction: column;
-        text-align: center;
-    }
-    
-    .ai-powered-text::before {
-        position: static;
-        display: block;
-        margin-bottom: 10px;
-    }
-}
+    The client is shared by every session, but httplib2 connections are not
+    thread-safe, so each worker thread keeps a keep-alive Http of its own.
+    Background threads pass the `connections` holder captured on the script thread.
+    """
+    import httplib2
+
+    if connections is None:
+        connections = _youtube_connections()
+    http = getattr(connections, "http", None)
+    if http is None:
+        http = connections.http = httplib2.Http(timeout=30)
+    return request.execute(http=http, num_retries=num_retries)
+
+# ─── Background Work ─────────────────────────────────────────────────────────
+@st.cache_resource
+def get_background_executor():
+    """Shared thread pool for network work that must not block the script thread
+
+    Tasks on it must never wait on other tasks submitted to it: with every
+    worker busy, the awaited task would never start. Work that fans out
+    (like CommentFingerprinter) uses a pool of its own.
+    """
+    return ThreadPoolExecutor(max_workers=8, thread_name_prefix="yt-dashboard")
+
+# ─── Paginated Search ────────────────────────────────────────────────────────
+SEARCH_PAGE_SIZE = 50  # YouTube API maximum per search page
+
+def normalize_search_query(query):
+    """Case- and whitespace-insensitive form of a query, used as the cache key"""
+    return " ".join(query.lower().split())
+
+VIDEOS_LIST_BATCH_SIZE = 50  # YouTube API maximum IDs per videos.list call
+
+def parse_iso8601_duration(value):
+    """Seconds in a YouTube contentDetails duration such as 'PT1H2M10S'"""
+    match = re.fullmatch(r'P(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?', value or "")
+    if not match:
+        return None
+    days, hours, minutes, seconds = (int(part or 0) for part in match.groups())
+    return ((days * 24 + hours) * 60 + minutes) * 60 + seconds
+
+def format_count(value):
+    """Compact count for cards: 950, 12.3K, 4.1M"""
+    if value is None:
+        return ""
+    for threshold, suffix in ((1_000_000_000, "B"), (1_000_000, "M"), (1_000, "K")):
+        if value >= threshold:
+            return f"{value / threshold:.1f}{suffix}"
+    return str(value)
+
+def format_duration(seconds):
+    if seconds is None:
+        return ""
+    hours, remainder = divmod(seconds, 3600)
+    minutes, seconds = divmod(remainder, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes}:{seconds:02d}"
+
+class VideoEnricher:
+    """Adds comment count, view count and duration to search result dicts.
+
+    Uncached video IDs are looked up with videos.list in batches of 50, with
+    batches running concurrently, and each video's stats are cached with a
+    TTL. A comment_count of None means comments are disabled.
+    """
 
-  .main-header::before {
-    content: '';
-    position: absolute;
-    top: 0;
-    left: -100%;
-    width: 100%;
-    height: 100%;
-    background: linear-gradient(90deg, transparent, rgba(255,255,255,0.4), transparent);
-    animation: shimmer 3s infinite;
-  }
-
-  @keyframes shimmer {
-    0% { left: -100%; }
-    100% { left: 100%; }
-  }
-
-  .youtube-logo { 
-    height: 90px; 
-    width: auto; 
-    filter: drop-shadow(0 8px 16px rgba(255,0,0,0.3));
-    transition: transform 0.3s ease;
-  }
-
-  .youtube-logo:hover {
-    transform: scale(1.05) rotate(2deg);
-  }
-
-  .project-title { 
-    font-size: 3.5em; 
-    font-weight: 900; 
-    background: linear-gradient(135deg, #FF0000 0%, #FF4500 25%, #FF6B6B 50%, #CC0000 75%, #8B0000 100%);
-    -webkit-background-clip: text;
-    -webkit-text-fill-color: transparent;
-    background-clip: text;
-    text-shadow: 0 4px 8px rgba(255,0,0,0.2);
-    position: relative;
-    animation: titleGlow 2s ease-in-out infinite alternate;
-  }
-
-  @keyframes titleGlow {
-    from { filter: drop-shadow(0 0 5px rgba(255,0,0,0.3)); }
-    to { filter: drop-shadow(0 0 20px rgba(255,0,0,0.6)); }
-  }
-
-  .subtitle {
-    font-size: 1.3em;
-    color: #555;
-    font-weight: 500;
-    margin-top: 15px;
-    background: linear-gradient(135deg, #667eea, #764ba2);
-    -webkit-background-clip: text;
-    -webkit-text-fill-color: transparent;
-    background-clip: text;
-  }
-  
-  @keyframes slideInDown {
-    from { transform: translateY(-30px); opacity: 0; }
-    to { transform: translateY(0); opacity: 1; }
-  }
-  
-  .youtube-logo { 
-    height: 80px; 
-    width: auto; 
-    filter: drop-shadow(0 4px 8px rgba(0,0,0,0.1));
-  }
-  
-  .project-title { 
-    font-size: 3.2em; 
-    font-weight: 800; 
-    background: linear-gradient(135deg, #FF0000, #CC0000, #FF6B6B);
-    -webkit-background-clip: text;
-    -webkit-text-fill-color: transparent;
-    background-clip: text;
-    text-shadow: 0 2px 4px rgba(0,0,0,0.1);
-  }
-  
-  .subtitle {
-    font-size: 1.2em;
-    color: #666;
-    font-weight: 400;
-    margin-top: 10px;
-  }
-  
-  /* Container Styles */
-  .glass-container { 
-    background: rgba(255, 255, 255, 0.95);
-    backdrop-filter: blur(20px);
-    padding: 35px;
-    border-radius: 20px;
-    margin-bottom: 25px;
-    box-shadow: 0 20px 40px rgba(0,0,0,0.1);
-    border: 1px solid rgba(255,255,255,0.2);
-    animation: fadeInUp 0.6s ease-out;
-  }
-  
-  @keyframes fadeInUp {
-    from { transform: translateY(30px); opacity: 0; }
-    to { transform: translateY(0); opacity: 1; }
-  }
-  
-  /* Search Styles */
-  .search-header {
-    font-size: 1.8em;
-    font-weight: 700;
-    color: #333;
-    margin-bottom: 20px;
-    display: flex;
-    align-items: center;
-    gap: 10px;
-  }
-  
-  .stTextInput > div > div > input {
-    border-radius: 15px !important;
-    border: 2px solid #e0e0e0 !important;
-    padding: 15px 20px !important;
-    font-size: 16px !important;
-    transition: all 0.3s ease !important;
-  }
-  
-  .stTextInput > div > div > input:focus {
-    border-color: #667eea !important;
-    box-shadow: 0 0 0 3px rgba(102, 126, 234, 0.1) !important;
-  }
-  
-  /* Video Card Styles */
-  .video-card {
-    background: rgba(255, 255, 255, 0.9);
-    border-radius: 15px;
-    padding: 25px;
-    margin: 20px 0;
-    box-shadow: 0 10px 30px rgba(0,0,0,0.1);
-    transition: all 0.3s ease;
-    border: 1px solid rgba(255,255,255,0.3);
-  }
-  
-  .video-card:hover {
-    transform: translateY(-5px);
-    box-shadow: 0 20px 40px rgba(0,0,0,0.15);
-    background: rgba(255, 255, 255, 1);
-  }
-  
-  .video-title {
-    font-size: 1.3em;
-    font-weight: 700;
-    color: #000000;
-    margin-bottom: 8px;
-  }
-
-  /* For dashboard video title - FIXED */
-  .dashboard-video-title {
-    color: #000000 !important;
-    font-weight: 700 !important;
-    font-size: 1.4em !important;
-  }
-  
-  /* Fix for markdown links in dashboard */
-  .dashboard-video-title a {
-    color: #000000 !important;
-    text-decoration: none !important;
-  }
-  
-  .dashboard-video-title a:hover {
-    color: #333333 !important;
-    text-decoration: underline !important;
-  }
-  
-  .video-meta {
-    color: #444;
-    font-size: 1em;
-    margin-bottom: 15px;
-    font-weight: 500;
-    display: flex;
-    align-items: center;
-    gap: 15px;
-    flex-wrap: wrap;
-  }
-
-  .meta-item {
-    display: flex;
-    align-items: center;
-    gap: 5px;
-    background: rgba(102, 126, 234, 0.1);
-    padding: 6px 12px;
-    border-radius: 20px;
-    font-size: 0.95em;
-    font-weight: 600;
-    color: #333;
-    border: 1px solid rgba(102, 126, 234, 0.2);
-    transition: all 0.3s ease;
-  }
-
-  .meta-item:hover {
-    background: rgba(102, 126, 234, 0.2);
-    transform: translateY(-1px);
-  }
-
-  .video-description {
-    color: #555;
-    font-size: 0.95em;
-    line-height: 1.5;
-    margin-top: 10px;
-    font-weight: 400;
-    background: rgba(0,0,0,0.03);
-    padding: 12px 15px;
-    border-radius: 10px;
-    border-left: 3px solid #667eea;
-  }
-  
-  /* Metric Cards */
-  .metric-card {
-    background: linear-gradient(135deg, #667eea, #764ba2);
-    color: white;
-    padding: 25px;
-    border-radius: 15px;
-    text-align: center;
-    box-shadow: 0 10px 30px rgba(0,0,0,0.2);
-    transition: transform 0.3s ease;
-  }
-  
-  .metric-card:hover {
-    transform: translateY(-3px);
-  }
-  
-  .metric-value {
-    font-size: 2.5em;
-    font-weight: 700;
-    margin-bottom: 5px;
-  }
-  
-  .metric-label {
-    font-size: 0.9em;
-    opacity: 0.9;
-  }
-  
-  /* Buttons */
-  .stButton > button { 
-    background: linear-gradient(135deg, #667eea, #764ba2) !important;
-    color: white !important;
-    border: none !important;
-    border-radius: 12px !important;
-    padding: 12px 28px !important;
-    font-weight: 600 !important;
-    font-size: 16px !important;
-    transition: all 0.3s ease !important;
-    box-shadow: 0 4px 15px rgba(102, 126, 234, 0.3) !important;
-  }
-  
-  .stButton > button:hover { 
-    transform: translateY(-2px) !important;
-    box-shadow: 0 8px 25px rgba(102, 126, 234, 0.4) !important;
-    background: linear-gradient(135deg, #5a67d8, #6b46c1) !important;
-  }
-  
-  /* Status Messages */
-  .status-success {
-    background: linear-gradient(135deg, #48bb78, #38a169);
-    color: white;
-    padding: 20px;
-    border-radius: 12px;
-    text-align: center;
-    font-weight: 600;
-    margin: 20px 0;
-    box-shadow: 0 4px 15px rgba(72, 187, 120, 0.3);
-  }
-  
-  .status-processing {
-    background: linear-gradient(135deg, #ed8936, #dd6b20);
-    color: white;
-    padding: 20px;
-    border-radius: 12px;
-    text-align: center;
-    font-weight: 600;
-    margin: 20px 0;
-    box-shadow: 0 4px 15px rgba(237, 137, 54, 0.3);
-  }
-  
-  .status-error {
-    background: linear-gradient(135deg, #f56565, #e53e3e);
-    color: white;
-    padding: 20px;
-    border-radius: 12px;
-    text-align: center;
-    font-weight: 600;
-    margin: 20px 0;
-    box-shadow: 0 4px 15px rgba(245, 101, 101, 0.3);
-  }
-  
-  /* Loading Animations */
-  .loading-container {
-    display: flex;
-    flex-direction: column;
-    align-items: center;
-    padding: 40px;
-  }
-  
-  .spinner {
-    width: 60px;
-    height: 60px;
-    border: 4px solid #f3f3f3;
-    border-top: 4px solid #667eea;
-    border-radius: 50%;
-    animation: spin 1s linear infinite;
-    margin-bottom: 20px;
-  }
-  
-  @keyframes spin {
-    0% { transform: rotate(0deg); }
-    100% { transform: rotate(360deg); }
-  }
-  
-  .loading-text {
-    font-size: 1.2em;
-    color: #667eea;
-    font-weight: 600;
-    text-align: center;
-  }
-  
-  .loading-dots::after {
-    content: '';
-    animation: dots 1.5s steps(5, end) infinite;
-  }
-  
-  @keyframes dots {
-    0%, 20% { content: ''; }
-    40% { content: '.'; }
-    60% { content: '..'; }
-    80%, 100% { content: '...'; }
-  }
-  
-  /* Insights Container */
-  .insights-container {
-    background: linear-gradient(135deg, rgba(168, 237, 234, 0.2), rgba(254, 214, 227, 0.2));
-    border-radius: 15px;
-    padding: 25px;
-    margin: 20px 0;
-    border: 1px solid rgba(168, 237, 234, 0.3);
-    backdrop-filter: blur(10px);
-  }
-  
-  /* Download Section */
-  .download-section {
-    background: linear-gradient(135deg, rgba(102, 126, 234, 0.1), rgba(118, 75, 162, 0.1));
-    border-radius: 15px;
-    padding: 25px;
-    margin: 20px 0;
-    border: 1px solid rgba(102, 126, 234, 0.2);
-  }
-  
-  /* Progress Bar */
-  .progress-container {
-    background: rgba(255, 255, 255, 0.8);
-    border-radius: 10px;
-    padding: 20px;
-    margin: 20px 0;
-  }
-  
-  .progress-bar {
-    width: 100%;
-    height: 8px;
-    background: #e2e8f0;
-    border-radius: 4px;
-    overflow: hidden;
-  }
-  
-  .progress-bar-fill {
-    height: 100%;
-    background: linear-gradient(135deg, #667eea, #764ba2);
-    border-radius: 4px;
-    animation: progress 2s ease-in-out infinite;
-  }
-  
-  @keyframes progress {
-    0% { width: 30%; }
-    50% { width: 70%; }
-    100% { width: 30%; }
-  }
-  
-  /* Charts Container */
-  .chart-container {
-    background: rgba(255, 255, 255, 0.98);
-    border-radius: 15px;
-    padding: 20px;
-    margin: 15px 0;
-    box-shadow: 0 4px 15px rgba(0,0,0,0.05);
-  }
-  
-  /* Footer */
-  .footer {
-    text-align: center;
-    color: rgba(255,255,255,0.8);
-    padding: 30px;
-    font-size: 1.1em;
-    background: rgba(255,255,255,0.1);
-    border-radius: 15px;
-    margin-top: 40px;
-    backdrop-filter: blur(10px);
-  }
-
-/* Video Card Container */
-.video-card {
-    background: rgba(255, 255, 255, 0.98);
-    border-radius: 16px;
-    padding: 24px;
-    margin: 20px 0;
-    box-shadow: 0 8px 32px rgba(0, 0, 0, 0.08);
-    border: 1px solid rgba(255, 255, 255, 0.18);
-    transition: all 0.3s ease;
-}
+    def __init__(self, client, cache, connections, executor):
+        self.client = client
+        self.cache = cache
+        self.connections = connections
+        self.executor = executor
 
-.video-card:hover {
-    transform: translateY(-4px);
-    box-shadow: 0 12px 48px rgba(0, 0, 0, 0.12);
-}
+    def _fetch_batch(self, video_ids):
+        request = self.client.videos().list(
+            part="statistics,contentDetails", id=",".join(video_ids), maxResults=VIDEOS_LIST_BATCH_SIZE
+        )
+        resp = youtube_execute(request, connections=self.connections)
+        stats = {}
+        for item in resp.get("items", []):
+            statistics = item.get("statistics", {})
+            stats[item["id"]] = {
+                "comment_count": int(statistics["commentCount"]) if "commentCount" in statistics else None,
+                "view_count": int(statistics.get("viewCount", 0)),
+                "duration": parse_iso8601_duration(item.get("contentDetails", {}).get("duration")),
+            }
+            self.cache.set(["video_stats", item["id"]], stats[item["id"]])
+        return stats
+
+    def enrich(self, videos):
+        """Copies of `videos` with stats fields added"""
+        stats = {}
+        missing = []
+        for video in videos:
+            cached = self.cache.get(["video_stats", video["video_id"]])
+            if cached is None:
+                missing.append(video["video_id"])
+            else:
+                stats[video["video_id"]] = cached
+        
+        batches = [missing[i:i + VIDEOS_LIST_BATCH_SIZE] for i in range(0, len(missing), VIDEOS_LIST_BATCH_SIZE)]
+        if len(batches) == 1:
+            # A single batch runs inline, which also keeps callers already on a pool thread safe
+            stats.update(self._fetch_batch(batches[0]))
+        elif batches:
+            for future in [self.executor.submit(self._fetch_batch, batch) for batch in batches]:
+                stats.update(future.result())
+        
+        return [dict(video, **stats.get(video["video_id"], {})) for video in videos]
+
+@st.cache_resource
+def get_video_stats_cache():
+    """Per-video statistics from videos.list, shared by every session"""
+    ttl = int(st.secrets.get("VIDEO_STATS_TTL", os.getenv("VIDEO_STATS_TTL", "3600")))
+    return TieredCache("video_stats", maxsize=5000, ttl=ttl, store=get_cache_store())
+
+class SearchPager:
+    """Lazily pages through the results of one search.
+
+    Pages are fetched on demand by following ``nextPageToken`` and stored in the
+    shared search cache. Whenever a new page is loaded, the page after it is
+    prefetched on a background thread while the user reads the current one.
+    With an enricher, every page (prefetched ones included) also gets video stats.
+    All arguments are captured on the script thread, so background fetches
+    never call into Streamlit.
+    """
 
-/* Thumbnail Styles */
-.thumbnail-container {
-    position: relative;
-    width: 100%;
-    border-radius: 12px;
-    overflow: hidden;
-    box-shadow: 0 8px 24px rgba(0, 0, 0, 0.12);
-}
+    def __init__(self, client, cache, connections, executor, params, limit, enricher=None):
+        self.client = client
+        self.enricher = enricher
+        self.cache = cache
+        self.connections = connections
+        self.executor = executor
+        self.params = params
+        self.limit = limit
+        self.total_estimate = None
+        self.last_from_cache = False
+        self._cache_key = [
+            normalize_search_query(params["q"]),
+            params["maxResults"],
+            params.get("regionCode", ""),
+            params.get("relevanceLanguage", ""),
+        ]
+        self._lock = threading.Lock()
+        self._pages = []
+        self._next_token = None
+        self._exhausted = False
+        self._prefetch = None
+
+    def _fetch(self, page_token):
+        key = self._cache_key + [page_token or ""]
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached, True
+        
+        params = dict(self.params)
+        if page_token:
+            params["pageToken"] = page_token
+        resp = youtube_execute(self.client.search().list(**params), connections=self.connections)
+        page = {
+            "results": [
+                {
+                    "video_id": item["id"]["videoId"],
+                    "title": item["snippet"]["title"],
+                    "channel": item["snippet"]["channelTitle"],
+                    "published": item["snippet"]["publishedAt"][:10],
+                    "thumbnail": item["snippet"]["thumbnails"]["medium"]["url"],
+                    "description": item["snippet"]["description"]
+                }
+                for item in resp["items"]
+            ],
+            "next_page_token": resp.get("nextPageToken"),
+            "total_results": resp.get("pageInfo", {}).get("totalResults"),
+        }
+        self.cache.set(key, page)
+        return page, False
+
+    def _fetch_enriched(self, page_token):
+        page, from_cache = self._fetch(page_token)
+        if self.enricher is not None and page["results"]:
+            try:
+                page = dict(page, results=self.enricher.enrich(page["results"]))
+            except Exception as e:
+                # Stats are a nice-to-have; keep the plain results
+                logger.warning("Video enrichment failed: %s", e)
+        return page, from_cache
+
+    def _loaded_count(self):
+        return sum(len(page) for page in self._pages)
+
+    def _schedule_prefetch(self):
+        if self._next_token and self._loaded_count() < self.limit and self._prefetch is None:
+            self._prefetch = (self._next_token, self.executor.submit(self._fetch_enriched, self._next_token))
+
+    def page(self, index):
+        """Page `index`, loading it (and prefetching its successor) if needed"""
+        with self._lock:
+            if index < len(self._pages):
+                return self._pages[index]
+            if self._exhausted or index > len(self._pages):
+                return None
+            
+            page_token = self._next_token
+            if index > 0 and not page_token:
+                self._exhausted = True
+                return None
+            
+            page = None
+            if self._prefetch is not None and self._prefetch[0] == page_token:
+                try:
+                    page, self.last_from_cache = self._prefetch[1].result()
+                except Exception as e:
+                    logger.warning("Search prefetch failed, fetching inline: %s", e)
+                self._prefetch = None
+            if page is None:
+                page, self.last_from_cache = self._fetch_enriched(page_token)
+            
+            self._pages.append(page["results"])
+            self._next_token = page["next_page_token"]
+            if self.total_estimate is None:
+                self.total_estimate = page["total_results"]
+            if not self._next_token or not page["results"]:
+                self._exhausted = True
+            self._schedule_prefetch()
+            return page["results"]
+
+    def iter_results(self, count):
+        """Yield up to `count` results (capped at the pager limit), loading pages lazily"""
+        count = min(count, self.limit)
+        served = 0
+        index = 0
+        while served < count:
+            page = self.page(index)
+            if page is None:
+                return
+            for video in page[:count - served]:
+                yield video
+                served += 1
+            index += 1
+
+    def has_more(self, count):
+        """Whether results beyond the first `count` may exist"""
+        if count >= self.limit:
+            return False
+        with self._lock:
+            return not self._exhausted or self._loaded_count() > count
 
-.thumbnail-wrapper {
-    position: relative;
-    padding-top: 56.25%; /* 16:9 Aspect Ratio */
-}
+# ─── Shared GCS Clients ──────────────────────────────────────────────────────
+class StorageClientPool:
+    """Thread-safe, process-wide cache of storage clients and bucket handles.
 
-.thumbnail-wrapper img {
-    position: absolute;
-    top: 0;
-    left: 0;
-    width: 100%;
-    height: 100%;
-    object-fit: cover;
-    transition: transform 0.5s ease;
-}
+    Clients are keyed by service account and project, so every session reuses
+    one authorized HTTP session (keep-alive connections, one token refresh)
+    instead of building a new client for every results check.
+    """
 
-.thumbnail-wrapper:hover img {
-    transform: scale(1.05);
-}
+    def __init__(self, pool_maxsize=32):
+        self.pool_maxsize = pool_maxsize
+        self._lock = threading.Lock()
+        self._clients = {}
+        self._buckets = {}
+
+    @staticmethod
+    def _key(credentials, project):
+        return (getattr(credentials, "service_account_email", None), project)
+
+    def client(self, credentials, project):
+        from google.auth.transport.requests import AuthorizedSession
+        from google.cloud import storage
+        from requests.adapters import HTTPAdapter
+
+        key = self._key(credentials, project)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                session = AuthorizedSession(credentials)
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.pool_maxsize)
+                session.mount("https://", adapter)
+                client = storage.Client(project=project, credentials=credentials, _http=session)
+                self._clients[key] = client
+        return client
+
+    def bucket(self, credentials, project, bucket_name):
+        key = self._key(credentials, project) + (bucket_name,)
+        with self._lock:
+            bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self.client(credentials, project).bucket(bucket_name)
+            with self._lock:
+                bucket = self._buckets.setdefault(key, bucket)
+        return bucket
+
+@st.cache_resource(show_spinner=False)
+def get_storage_pool():
+    """One client pool per process, shared by all sessions"""
+    return StorageClientPool(pool_maxsize=int(st.secrets.get("GCS_POOL_SIZE", os.getenv("GCS_POOL_SIZE", "32"))))
+
+def get_results_bucket(bucket_name):
+    """Pooled bucket handle for the app's service account.
+
+    Batch workers call this off the script thread, so the cached factories it
+    reaches are declared without spinners, which need a script run context.
+    """
+    google_creds, google_project = get_google_credentials()
+    return get_storage_pool().bucket(google_creds, google_project, bucket_name)
 
-.play-button {
-    position: absolute;
-    top: 50%;
-    left: 50%;
-    transform: translate(-50%, -50%) scale(0.9);
-    width: 48px;
-    height: 48px;
-    background: rgba(0, 0, 0, 0.7);
-    border-radius: 50%;
-    display: flex;
-    align-items: center;
-    justify-content: center;
-    opacity: 0;
-    transition: all 0.3s ease;
-}
+# ─── Result Index ────────────────────────────────────────────────────────────
+# Pointer objects the pipeline writes per video: <prefix><VIDEO_ID>.json
+RESULTS_INDEX_PREFIX = st.secrets.get("RESULTS_INDEX_PREFIX", os.getenv("RESULTS_INDEX_PREFIX", "latest/"))
 
-.thumbnail-wrapper:hover .play-button {
-    opacity: 1;
-    transform: translate(-50%, -50%) scale(1);
-}
+# How long to skip pointer reads for a video after finding none for it
+POINTER_MISSING_RETRY_SECONDS = 300
 
-.duration-badge {
-    position: absolute;
-    bottom: 8px;
-    right: 8px;
-    background: rgba(0, 0, 0, 0.85);
-    color: white;
-    padding: 2px 6px;
-    border-radius: 4px;
-    font-size: 12px;
-    font-weight: 600;
-}
+class ResultIndex:
+    """Process-wide index of the newest result object per (bucket, video ID).
 
-/* Content Styles */
-.video-title {
-    font-size: 1.4em;
-    font-weight: 700;
-    color: #1a1a1a;
-    margin-bottom: 12px;
-    line-height: 1.4;
-    display: flex;
-    align-items: center;
-    gap: 8px;
-}
+    The preferred source is a pointer object written by the pipeline,
+    ``{"name": ..., "generation": ...}``, re-read with a generation-not-match
+    precondition so an unchanged pointer costs a 304 and no body. Videos
+    without a pointer fall back to listing deltas: each lookup lists from the
+    last name seen via ``start_offset``, which relies on result names sorting
+    in creation order (``<VIDEO_ID>_<timestamp>``).
+    """
 
-.verified-badge {
-    display: inline-flex;
-    align-items: center;
-}
+    def __init__(self, index_prefix):
+        self.index_prefix = index_prefix
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._pointer_missing_until = {}
+
+    def lookup(self, bucket, video_id):
+        """Return (blob_name, generation) of the newest result, or None"""
+        key = (bucket.name, video_id)
+        with self._lock:
+            entry = dict(self._entries.get(key, {}))
+            pointer_missing = self._pointer_missing_until.get(key, 0) > time.time()
+        
+        if pointer_missing or not self._read_pointer(bucket, video_id, entry):
+            self._scan_listing(bucket, video_id, entry)
+        
+        with self._lock:
+            self._entries[key] = entry
+        if entry.get("name"):
+            return entry["name"], entry["generation"]
+        return None
 
-.video-meta {
-    display: flex;
-    gap: 16px;
-    margin-bottom: 16px;
-    flex-wrap: wrap;
-}
+    def _read_pointer(self, bucket, video_id, entry):
+        """Refresh entry from the video's pointer object; False when there is none"""
+        from google.api_core.exceptions import NotFound, NotModified
 
-.meta-item {
-    display: flex;
-    align-items: center;
-    gap: 6px;
-    padding: 6px 12px;
-    border-radius: 20px;
-    font-size: 0.9em;
-    font-weight: 500;
-    transition: all 0.3s ease;
-}
+        blob = bucket.blob(f"{self.index_prefix}{video_id}.json")
+        try:
+            if entry.get("pointer_generation"):
+                data = blob.download_as_bytes(if_generation_not_match=entry["pointer_generation"])
+            else:
+                data = blob.download_as_bytes()
+        except NotModified:
+            return True
+        except NotFound:
+            with self._lock:
+                self._pointer_missing_until[(bucket.name, video_id)] = time.time() + POINTER_MISSING_RETRY_SECONDS
+            return False
+        
+        pointer = json.loads(data)
+        entry["pointer_generation"] = blob.generation
+        entry["name"] = pointer["name"]
+        entry["generation"] = pointer.get("generation")
+        return True
+
+    def _scan_listing(self, bucket, video_id, entry):
+        """Fold listing results after the last seen name into entry"""
+        # The separator keeps IDs that merely start with this one out of the listing
+        kwargs = {"prefix": f"{video_id}_"}
+        if entry.get("listed_up_to"):
+            # start_offset is inclusive, so the last seen object comes back once more
+            kwargs["start_offset"] = entry["listed_up_to"]
+        
+        for blob in bucket.list_blobs(**kwargs):
+            if "/" in blob.name:
+                continue
+            entry["listed_up_to"] = max(entry.get("listed_up_to", ""), blob.name)
+            if entry.get("time_created") is None or blob.time_created > entry["time_created"]:
+                entry["name"] = blob.name
+                entry["generation"] = blob.generation
+                entry["time_created"] = blob.time_created
+
+@st.cache_resource(show_spinner=False)
+def get_result_index():
+    """One result index per process, shared by all sessions"""
+    return ResultIndex(RESULTS_INDEX_PREFIX)
+
+# ─── Result Content Cache ────────────────────────────────────────────────────
+RESULTS_CACHE_DIR = st.secrets.get(
+    "RESULTS_CACHE_DIR",
+    os.getenv("RESULTS_CACHE_DIR", os.path.join(tempfile.gettempdir(), "yt-sentiment-results")),
+)
+RESULTS_CACHE_MAX_AGE_SECONDS = 7 * 24 * 3600
+
+class BlobContentCache:
+    """On-disk cache of result object contents keyed by (name, generation).
+
+    A generation pins immutable object content, so a hit costs at most the
+    metadata request needed to learn the generation and never a download.
+    """
 
-.meta-item.primary {
-    background: linear-gradient(135deg, rgba(102, 126, 234, 0.1), rgba(118, 75, 162, 0.1));
-    color: #4a5568;
-}
+    def __init__(self, cache_dir, max_age=RESULTS_CACHE_MAX_AGE_SECONDS):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+        self._prune(max_age)
+
+    def _prune(self, max_age):
+        cutoff = time.time() - max_age
+        for entry in os.scandir(self.cache_dir):
+            try:
+                if entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+            except OSError:
+                pass
+
+    def _path(self, name, generation):
+        digest = hashlib.sha256(f"{name}#{generation}".encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.txt")
+
+    def get(self, name, generation):
+        try:
+            with open(self._path(name, generation), encoding="utf-8") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def put(self, name, generation, content):
+        path = self._path(name, generation)
+        # Write-then-rename so concurrent readers never see a partial file
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+
+    def fetch_text(self, blob):
+        """Blob content, downloading only when (name, generation) is not cached"""
+        if blob.generation is None:
+            blob.reload()
+        content = self.get(blob.name, blob.generation)
+        if content is None:
+            # The blob handle is pinned to this generation, so the download matches the key
+            content = blob.download_as_text()
+            self.put(blob.name, blob.generation, content)
+        return content
+
+@st.cache_resource(show_spinner=False)
+def get_blob_content_cache():
+    """One content cache per process, shared by all sessions"""
+    return BlobContentCache(RESULTS_CACHE_DIR)
+
+# ─── Partial Results ─────────────────────────────────────────────────────────
+# Running aggregates the pipeline may write while it works: <prefix><VIDEO_ID>.json
+RESULTS_PARTIAL_PREFIX = st.secrets.get("RESULTS_PARTIAL_PREFIX", os.getenv("RESULTS_PARTIAL_PREFIX", "partial/"))
+
+# Progress records (sentiment_engine.progress_record) the pipeline may write: <prefix><VIDEO_ID>.json
+RESULTS_PROGRESS_PREFIX = st.secrets.get("RESULTS_PROGRESS_PREFIX", os.getenv("RESULTS_PROGRESS_PREFIX", "progress/"))
+
+# Minimum seconds between reads of one video's partial and progress objects
+PARTIAL_REFRESH_SECONDS = 10
+PROGRESS_REFRESH_SECONDS = 5
+
+class PartialObjectReader:
+    """Process-wide reader of one kind of in-progress JSON object, one entry per (bucket, video ID).
+
+    Each object is re-read at most every `refresh_seconds`, with a
+    generation-not-match precondition, so an unchanged object costs a 304
+    and sessions watching the same video share one read.
+    """
 
-.meta-item.secondary {
-    background: linear-gradient(135deg, rgba(66, 153, 225, 0.1), rgba(99, 179, 237, 0.1));
-    color: #4a5568;
-}
+    def __init__(self, prefix, refresh_seconds=PARTIAL_REFRESH_SECONDS):
+        self.prefix = prefix
+        self.refresh_seconds = refresh_seconds
+        self._lock = threading.Lock()
+        self._entries = {}
+
+    def read(self, bucket, video_id):
+        """Latest object for the video as a dict, or None"""
+        from google.api_core.exceptions import NotFound, NotModified
+
+        key = (bucket.name, video_id)
+        with self._lock:
+            entry = dict(self._entries.get(key, {}))
+        if time.time() - entry.get("checked_at", 0) < self.refresh_seconds:
+            return entry.get("data")
+        
+        blob = bucket.blob(f"{self.prefix}{video_id}.json")
+        try:
+            if entry.get("generation"):
+                data = blob.download_as_bytes(if_generation_not_match=entry["generation"])
+            else:
+                data = blob.download_as_bytes()
+            entry["data"] = json.loads(data)
+            entry["generation"] = blob.generation
+        except NotModified:
+            pass
+        except NotFound:
+            entry.pop("data", None)
+            entry.pop("generation", None)
+        
+        entry["checked_at"] = time.time()
+        with self._lock:
+            self._entries[key] = entry
+        return entry.get("data")
 
-/* Description Styles */
-.description-container {
-    background: linear-gradient(135deg, rgba(247, 250, 252, 0.8), rgba(237, 242, 247, 0.8));
-    border-radius: 12px;
-    padding: 16px;
-    margin-top: 16px;
-    border: 1px solid rgba(226, 232, 240, 0.8);
-}
+@st.cache_resource(show_spinner=False)
+def get_partial_reader():
+    """One partial reader per process, shared by all sessions"""
+    return PartialObjectReader(RESULTS_PARTIAL_PREFIX)
 
-.description-content {
-    display: flex;
-    gap: 12px;
-    align-items: flex-start;
-}
+@st.cache_resource(show_spinner=False)
+def get_progress_reader():
+    """One progress reader per process, shared by all sessions"""
+    return PartialObjectReader(RESULTS_PROGRESS_PREFIX, refresh_seconds=PROGRESS_REFRESH_SECONDS)
 
-.description-icon {
-    flex-shrink: 0;
-    margin-top: 4px;
-}
+# ─── Result Notifications ────────────────────────────────────────────────────
+# Result objects are written as <VIDEO_ID>_<timestamp>.txt and YouTube video IDs
+# are always 11 characters, so the owning video can be read off the name.
+YOUTUBE_VIDEO_ID_LENGTH = 11
 
-.description-text {
-    color: #2d3748;
-    font-size: 0.95em;
-    line-height: 1.6;
-    margin: 0;
-    font-weight: 400;
-}
+# How often the live status fragment re-renders while an analysis is running
+STATUS_REFRESH_SECONDS = float(st.secrets.get("STATUS_REFRESH_SECONDS", os.getenv("STATUS_REFRESH_SECONDS", "2")))
 
-@keyframes fadeInUp {
-    from {
-        opacity: 0;
-        transform: translateY(20px);
-    }
-    to {
-        opacity: 1;
-        transform: translateY(0);
-    }
-}
-  
-  /* Responsive adjustments */
-  @media (max-width: 768px) {
-    .project-title { font-size: 2.2em; }
-    .glass-container { padding: 20px; }
-    .main-header { padding: 20px; }
-  }
-</style>
-""", unsafe_allow_html=True)
+# Safety-net GCS check when a notifier sees every result, in case a notification is lost
+NOTIFIER_FALLBACK_POLL_SECONDS = 120
 
-# ─── Session state init ───────────────────────────────────────────────────────
-if "search_results" not in st.session_state:
-    st.session_state.search_results = []
-if "selected_video" not in st.session_state:
-    st.session_state.selected_video = None
-if "raw_summary" not in st.session_state:
-    st.session_state.raw_summary = None
-if "ai_insights" not in st.session_state:
-    st.session_state.ai_insights = None
-if "analysis_status" not in st.session_state:
-    st.session_state.analysis_status = "idle"  # idle, processing, complete, error
-if "dashboard_mode" not in st.session_state:
-    st.session_state.dashboard_mode = False
-if "processing_stage" not in st.session_state:
-    st.session_state.processing_stage = ""
-if "analysis_start_time" not in st.session_state:
-    st.session_state.analysis_start_time = None
+# Idle per-replica Pub/Sub subscriptions are deleted by Pub/Sub after this (its minimum)
+REPLICA_SUBSCRIPTION_TTL_SECONDS = 24 * 3600
+
+def video_id_from_blob_name(blob_name):
+    """Return the video ID a result object belongs to"""
+    return blob_name[:YOUTUBE_VIDEO_ID_LENGTH]
+
+class ResultNotifier:
+    """Process-wide record of "result ready" events per video ID.
+
+    Subclasses feed object names into ``notify`` from a background thread, so a
+    session only has to do a dict lookup to learn its result has landed. Calling
+    ``notify`` directly makes the base class an in-process queue stand-in.
+    """
+
+    # Whether every result reaches this process; when False, a missing
+    # notification says nothing and results are polled on the usual schedule
+    delivers_all = True
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._events = {}
+
+    def start(self):
+        return self
+
+    def alive(self):
+        """Whether notifications are still coming in"""
+        return True
+
+    def notify(self, blob_name):
+        # Objects under a prefix (indexes, progress records) are not results
+        if not blob_name or "/" in blob_name:
+            return
+        with self._lock:
+            self._events[video_id_from_blob_name(blob_name)] = (blob_name, time.time())
+
+    def latest(self, video_id, since=0):
+        """Name of the newest result for video_id announced at or after `since`"""
+        with self._lock:
+            event = self._events.get(video_id)
+        if event and event[1] >= since:
+            return event[0]
+        return None
+
+class FileDropResultNotifier(ResultNotifier):
+    """Watches a local directory for dropped result files (tests and offline runs)"""
+
+    def __init__(self, drop_dir, interval=0.5):
+        super().__init__()
+        self.drop_dir = drop_dir
+        self.interval = interval
+        self._seen = set()
+
+    def start(self):
+        os.makedirs(self.drop_dir, exist_ok=True)
+        # Files already present belong to earlier runs
+        self._seen = set(os.listdir(self.drop_dir))
+        threading.Thread(target=self._watch, name="result-file-drop", daemon=True).start()
+        return self
+
+    def _watch(self):
+        while True:
+            try:
+                with os.scandir(self.drop_dir) as entries:
+                    for entry in entries:
+                        if entry.name not in self._seen and entry.is_file():
+                            self._seen.add(entry.name)
+                            self.notify(entry.name)
+            except OSError as e:
+                logger.warning("Result drop watcher error: %s", e)
+            time.sleep(self.interval)
+
+class PubSubResultNotifier(ResultNotifier):
+    """Listens for GCS OBJECT_FINALIZE notifications on a Pub/Sub subscription.
+
+    Pub/Sub hands each message on a subscription to one subscriber, so a
+    subscription shared by several replicas only tells one of them. Given the
+    notification `topic`, each process instead creates its own subscription,
+    named after `subscription`, the host and the process ID.
+    """
+
+    def __init__(self, subscription, bucket_name, project, credentials=None, topic=None):
+        super().__init__()
+        if topic:
+            replica = re.sub(r"[^A-Za-z0-9-]", "-", f"{socket.gethostname()}-{os.getpid()}")
+            subscription = f"{subscription}-{replica}"
+            if "/" not in topic:
+                topic = f"projects/{project}/topics/{topic}"
+        if "/" not in subscription:
+            subscription = f"projects/{project}/subscriptions/{subscription}"
+        self.subscription = subscription
+        self.topic = topic
+        self.delivers_all = bool(topic)
+        self.bucket_name = bucket_name
+        self.credentials = credentials
+        self._future = None
+        self._failure_logged = False
+
+    def start(self):
+        from google.api_core.exceptions import AlreadyExists
+        from google.cloud import pubsub_v1
+
+        subscriber = pubsub_v1.SubscriberClient(credentials=self.credentials)
+        if self.topic:
+            try:
+                subscriber.create_subscription(request={
+                    "name": self.subscription,
+                    "topic": self.topic,
+                    "expiration_policy": {"ttl": {"seconds": REPLICA_SUBSCRIPTION_TTL_SECONDS}},
+                })
+            except AlreadyExists:
+                pass  # This replica restarted with the same host name and PID
+        # The streaming pull runs on the client's own background threads
+        self._future = subscriber.subscribe(self.subscription, callback=self._on_message)
+        return self
+
+    def alive(self):
+        # The streaming pull future only finishes when the subscription fails for good
+        if self._future is None or not self._future.done():
+            return True
+        if not self._failure_logged:
+            self._failure_logged = True
+            try:
+                error = self._future.exception()
+            except Exception as e:  # Cancelled
+                error = e
+            logger.error("Pub/Sub result subscription %s stopped, falling back to polling: %r", self.subscription, error)
+        return False
+
+    def _on_message(self, message):
+        attributes = message.attributes
+        if attributes.get("eventType") == "OBJECT_FINALIZE" and attributes.get("bucketId") == self.bucket_name:
+            self.notify(attributes.get("objectId", ""))
+        message.ack()
+
+@st.cache_resource
+def _start_result_notifier(kind, target, bucket_name, project, _credentials=None, topic=None):
+    """One listener per process, shared by every session"""
+    if kind == "pubsub":
+        return PubSubResultNotifier(target, bucket_name, project, credentials=_credentials, topic=topic).start()
+    return FileDropResultNotifier(target).start()
+
+def get_result_notifier():
+    """Configured result notifier, or None to fall back to scheduled GCS polling"""
+    kind = (st.secrets.get("RESULT_NOTIFIER", os.getenv("RESULT_NOTIFIER")) or "").lower()
+    bucket_name = st.secrets.get("RESULTS_BUCKET", os.getenv("RESULTS_BUCKET"))
+    notifier = None
+    try:
+        if kind == "pubsub":
+            subscription = st.secrets.get("RESULTS_SUBSCRIPTION", os.getenv("RESULTS_SUBSCRIPTION"))
+            topic = st.secrets.get("RESULTS_TOPIC", os.getenv("RESULTS_TOPIC"))
+            if subscription:
+                google_creds, google_project = get_google_credentials()
+                notifier = _start_result_notifier(
+                    "pubsub", subscription, bucket_name, google_project, _credentials=google_creds, topic=topic,
+                )
+        elif kind == "filedrop":
+            drop_dir = st.secrets.get("RESULTS_DROP_DIR", os.getenv("RESULTS_DROP_DIR", "results_drop"))
+            notifier = _start_result_notifier("filedrop", drop_dir, bucket_name, None)
+    except Exception as e:
+        logger.warning("Result notifier unavailable, falling back to polling: %s", e)
+    if notifier is not None and not notifier.alive():
+        return None
+    return notifier
+
+# ─── Analysis Backends ───────────────────────────────────────────────────────
+def is_quota_error(error):
+    """Whether an analysis error is worth retrying after a backoff"""
+    return isinstance(error, AnalysisQuotaError) or bool(
+        re.search(r"quota|rate ?limit|\b429\b", str(error), re.IGNORECASE)
+    )
+
+# key identifies a result so a session can skip one it already showed;
+# source is a human-readable origin (object name, "local analysis")
+AnalysisResult = namedtuple("AnalysisResult", ["key", "source", "content"])
+
+class AnalysisBackend(abc.ABC):
+    """Where sentiment analysis runs.
+
+    ``submit`` starts an analysis for a video; ``fetch_result`` returns the
+    newest AnalysisResult for it, or None while there is none (or when its key
+    equals `seen`, or it was written before `since`); ``partial`` returns the running aggregate of a job still in
+    progress and ``progress`` how far it has got, if the backend reports them.
+    All are free of Streamlit UI calls.
+    """
+
+    name = ""
+    submit_stage = ""
+    # Whether fetch_result is cheap enough to call on every status refresh
+    cheap_poll = False
+    # Most comments one run fetches, when the backend caps it
+    comment_limit = None
+
+    def missing_config(self):
+        """Message describing missing configuration, or None"""
+        return None
+
+    @abc.abstractmethod
+    def submit(self, video_id, full=False):
+        """Start an analysis; `full` rules out incremental runs, for backends that have them"""
+
+    @abc.abstractmethod
+    def fetch_result(self, video_id, blob_name=None, seen=None, since=0):
+        """Newest AnalysisResult for the video, or None"""
+
+    def partial(self, video_id, since=0):
+        """sentiment_engine.RunningAggregate for an unfinished job, or None"""
+        return None
+
+    def progress(self, video_id, since=0):
+        """sentiment_engine.Progress for an unfinished job, or None"""
+        return None
+
+# Cloud Function requests. Failures before the request was sent (connect
+# timeouts, refused connections) and 502/503 from the gateway mean the function
+# never ran, so those are retried with jittered exponential backoff. A read
+# timeout or a 504 is not: the function may have started and still be
+# extracting comments, and a retry would start a duplicate pipeline run.
+FUNCTION_CONNECT_TIMEOUT_SECONDS = 10
+FUNCTION_READ_TIMEOUT_SECONDS = 30
+FUNCTION_SUBMIT_ATTEMPTS = 3
+FUNCTION_BACKOFF_SECONDS = 1.0
+FUNCTION_RETRY_STATUSES = (502, 503)
+FUNCTION_TIMEOUT_STATUS = 504
+
+def request_never_sent(error):
+    """Whether a requests ConnectionError happened before the request reached the server"""
+    from urllib3.exceptions import NewConnectionError
+
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    reason = getattr(error.args[0], "reason", None) if error.args else None
+    return isinstance(reason, NewConnectionError)
+
+@st.cache_resource(show_spinner=False)
+def get_function_session():
+    """Pooled HTTP session for Cloud Function calls, shared by all sessions and batch workers"""
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+    return session
+
+class CloudFunctionBackend(AnalysisBackend):
+    """Cloud Function extracts comments; Dataflow writes the summary to RESULTS_BUCKET"""
+
+    name = "cloud"
+    submit_stage = "Sending request to cloud function..."
+
+    def __init__(self, func_url, bucket_name, session=None):
+        self.func_url = func_url
+        self.bucket_name = bucket_name
+        self.session = session or requests.Session()
+
+    def missing_config(self):
+        if not self.func_url or not self.bucket_name:
+            return "COMMENTS_FUNC_URL or RESULTS_BUCKET missing in configuration."
+        return None
+
+    def submit(self, video_id, full=False):
+        for attempt in range(1, FUNCTION_SUBMIT_ATTEMPTS + 1):
+            try:
+                response = self.session.post(
+                    self.func_url, 
+                    json={"video_url": f"https://www.youtube.com/watch?v={video_id}"},
+                    timeout=(FUNCTION_CONNECT_TIMEOUT_SECONDS, FUNCTION_READ_TIMEOUT_SECONDS)
+                )
+            except requests.exceptions.ConnectionError as e:
+                if attempt == FUNCTION_SUBMIT_ATTEMPTS or not request_never_sent(e):
+                    raise
+            else:
+                if response.status_code not in FUNCTION_RETRY_STATUSES or attempt == FUNCTION_SUBMIT_ATTEMPTS:
+                    break
+            time.sleep(FUNCTION_BACKOFF_SECONDS * 2 ** (attempt - 1) * random.uniform(0.5, 1.0))
+        if response.status_code == FUNCTION_TIMEOUT_STATUS:
+            # Handled like a read timeout: the run is claimed and polled for
+            raise requests.exceptions.ReadTimeout(
+                f"Function call timed out at the gateway (status {response.status_code})", response=response
+            )
+        if response.status_code == 429 or (response.status_code != 200 and "quota" in response.text.lower()):
+            raise AnalysisQuotaError(f"Function call hit a quota limit (status {response.status_code})")
+        if response.status_code != 200:
+            raise AnalysisSubmitError(f"Function call failed with status: {response.status_code}<br>Response: {response.text}")
+
+    def fetch_result(self, video_id, blob_name=None, seen=None, since=0):
+        bucket = get_results_bucket(self.bucket_name)
+        if blob_name:
+            latest_blob = bucket.get_blob(blob_name)
+        else:
+            found = get_result_index().lookup(bucket, video_id)
+            latest_blob = bucket.blob(found[0], generation=found[1]) if found else None
+        if latest_blob is None:
+            return None
+        
+        if latest_blob.generation is None:
+            latest_blob.reload()
+        # The generation is the object's creation time in microseconds; an
+        # object written before the run started is an earlier run's result
+        if latest_blob.generation / 1e6 < since:
+            return None
+        key = (latest_blob.name, latest_blob.generation)
+        if key == seen:
+            return None
+        # Served from the local cache when this generation was seen before
+        return AnalysisResult(key, latest_blob.name, get_blob_content_cache().fetch_text(latest_blob))
+
+    def partial(self, video_id, since=0):
+        try:
+            data = get_partial_reader().read(get_results_bucket(self.bucket_name), video_id)
+        except Exception:
+            # Partials are a preview; the status fragment keeps polling for the final result
+            return None
+        # A partial left over from an earlier run of this video is not progress
+        if data is None or data.get("updated_at", 0) < since:
+            return None
+        return sentiment_engine.RunningAggregate.from_dict(data)
+
+    def progress(self, video_id, since=0):
+        try:
+            data = get_progress_reader().read(get_results_bucket(self.bucket_name), video_id)
+        except Exception:
+            return None
+        progress = sentiment_engine.parse_progress(data) if data is not None else None
+        if progress is None or progress.updated_at < since:
+            return None
+        return progress
+
+class LocalAnalysisBackend(AnalysisBackend):
+    """Fetches and scores comments on this server, page by page.
+
+    An ingestion thread streams comment pages and hands each to the scoring
+    pool while it fetches the next; scored pages are folded into a
+    RunningAggregate in order, which ``partial`` exposes while the job runs.
+    Uses sentiment_engine's lexicon model and produces the same summary text
+    as the pipeline. With a fixture directory it runs fully offline.
+
+    Runs are incremental: each one saves a checkpoint (its aggregate and the
+    newest comment it saw), and the next run fetches and scores only comments
+    published after it, merging them into the saved aggregate. A checkpoint
+    whose full scan is older than LOCAL_CHECKPOINT_MAX_AGE_SECONDS is ignored,
+    however often it was updated since, so edits and deletions are picked up
+    by a full run at least that often.
+    """
+
+    name = "local"
+    submit_stage = "Fetching and scoring comments locally..."
+    cheap_poll = True
+
+    def __init__(self, executor, ingest_executor, checkpoints, api_key, fixture_dir, max_comments):
+        self.executor = executor
+        self.ingest_executor = ingest_executor
+        self.checkpoints = checkpoints
+        self.api_key = api_key
+        self.fixture_dir = fixture_dir
+        self.max_comments = self.comment_limit = max_comments
+        self._lock = threading.Lock()
+        self._jobs = {}
+        self._progress = {}
+
+    def missing_config(self):
+        if not self.api_key and not self.fixture_dir:
+            return "YOUTUBE_API_KEY or LOCAL_COMMENTS_DIR missing in configuration."
+        return None
+
+    def _checkpoint_key(self, video_id):
+        return ["checkpoint", "fixture" if self.fixture_dir else "api", video_id]
+
+    def _load_checkpoint(self, video_id):
+        """The video's checkpoint, unless its base full scan is too old to build on"""
+        checkpoint = self.checkpoints.get(self._checkpoint_key(video_id))
+        if checkpoint is None or checkpoint.get("full_scan_at", 0) < time.time() - LOCAL_CHECKPOINT_MAX_AGE_SECONDS:
+            return None
+        return checkpoint
+
+    def submit(self, video_id, full=False):
+        checkpoint = None if full else self._load_checkpoint(video_id)
+        if checkpoint is not None:
+            aggregate = sentiment_engine.RunningAggregate.from_dict(checkpoint["aggregate"])
+        else:
+            aggregate = sentiment_engine.RunningAggregate()
+        future = self.ingest_executor.submit(self._ingest, video_id, aggregate, checkpoint)
+        with self._lock:
+            self._jobs[video_id] = (time.time(), future, aggregate)
+
+    def _report(self, video_id, stage, fetched, scored, started_at, expected=None, incremental=False):
+        with self._lock:
+            self._progress[video_id] = sentiment_engine.parse_progress(
+                sentiment_engine.progress_record(
+                    stage, fetched, scored, started_at, comments_expected=expected, incremental=incremental,
+                )
+            )
+
+    def _ingest(self, video_id, aggregate, checkpoint):
+        """Score the video's comments into aggregate and return the result document
+
+        An incremental run that cannot reach its checkpoint within max_comments
+        starts over as a full run on a fresh aggregate, rather than merging
+        and skipping the comments between.
+        """
+        started_at = time.time()
+        try:
+            newest_page, new_comments = self._fold_pages(video_id, aggregate, checkpoint, started_at)
+        except sentiment_engine.CheckpointUnreachable:
+            stale, checkpoint = aggregate, None
+            aggregate = sentiment_engine.RunningAggregate()
+            with self._lock:
+                job = self._jobs.get(video_id)
+                if job is not None and job[2] is stale:
+                    self._jobs[video_id] = (job[0], job[1], aggregate)
+            newest_page, new_comments = self._fold_pages(video_id, aggregate, None, started_at)
+        
+        self._report(video_id, "writing", new_comments, new_comments, started_at, new_comments, checkpoint is not None)
+        updated = sentiment_engine.make_checkpoint(aggregate, newest_page, checkpoint, started_at)
+        if updated is not None:
+            self.checkpoints.set(self._checkpoint_key(video_id), updated)
+        summary = aggregate.summary(video_id, new_comments=new_comments if checkpoint is not None else None)
+        return sentiment_engine.result_document(video_id, aggregate, summary)
+
+    def _fold_pages(self, video_id, aggregate, checkpoint, started_at):
+        """Stream pages into the scoring pool, folding scores into aggregate in page order
+
+        Returns the first (newest) page and the number of comments scored.
+        """
+        pending = deque()
+        newest_page = None
+        new_comments = scored = 0
+        # Incremental runs fetch only new comments, so their size is unknown until fetching ends
+        incremental = checkpoint is not None
+        self._report(video_id, "fetching", 0, 0, started_at, incremental=incremental)
+
+        def fold(texts, scoring):
+            scores = scoring.result()
+            with self._lock:
+                aggregate.add(texts, scores)
+            return len(texts)
+
+        pages = sentiment_engine.iter_comment_pages(
+            video_id, self.api_key, self.fixture_dir, self.max_comments, checkpoint=checkpoint
+        )
+        for page in pages:
+            newest_page = newest_page or page
+            new_comments += len(page)
+            texts = [comment.text for comment in page]
+            pending.append((texts, self.executor.submit(sentiment_engine.score_comments, texts)))
+            while pending and pending[0][1].done():
+                scored += fold(*pending.popleft())
+            self._report(video_id, "fetching", new_comments, scored, started_at, incremental=incremental)
+        while pending:
+            scored += fold(*pending.popleft())
+            self._report(video_id, "scoring", new_comments, scored, started_at, new_comments, incremental)
+        return newest_page, new_comments
+
+    def partial(self, video_id, since=0):
+        with self._lock:
+            job = self._jobs.get(video_id)
+            if job is None or job[1].done():
+                return None
+            return sentiment_engine.RunningAggregate.from_dict(job[2].to_dict())
+
+    def progress(self, video_id, since=0):
+        with self._lock:
+            job = self._jobs.get(video_id)
+            if job is None or job[1].done():
+                return None
+            progress = self._progress.get(video_id)
+        # A record left over from an earlier run of this video is not progress
+        return progress if progress is not None and progress.updated_at >= since else None
+
+    def fetch_result(self, video_id, blob_name=None, seen=None, since=0):
+        with self._lock:
+            job = self._jobs.get(video_id)
+        if job is None or not job[1].done():
+            return None
+        
+        submitted_at, future, _ = job
+        if submitted_at < since:
+            return None
+        key = ("local", video_id, submitted_at)
+        if key == seen:
+            return None
+        try:
+            return AnalysisResult(key, "local analysis", future.result())
+        except Exception as e:
+            raise AnalysisFailedError(f"Local analysis failed: {e}") from e
+
+# Checkpoints building on a full scan older than this are dropped, forcing a new one
+LOCAL_CHECKPOINT_MAX_AGE_SECONDS = 7 * 24 * 3600
+
+@st.cache_resource
+def _local_analysis_backend(api_key, fixture_dir, max_comments, workers):
+    """One scoring pool and one ingestion pool per process.
+
+    Scoring runs on threads: worker processes would have to be forked from
+    the multithreaded server, and spawned ones re-run this script, which
+    Streamlit registers as __main__. Page fetches release the GIL, and so
+    does most of the NumPy work, so scoring still overlaps fetching.
+    """
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="local-scoring")
+    ingest_executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="local-ingest")
+    checkpoints = TieredCache(
+        "checkpoint", maxsize=256, ttl=LOCAL_CHECKPOINT_MAX_AGE_SECONDS, store=get_cache_store()
+    )
+    return LocalAnalysisBackend(executor, ingest_executor, checkpoints, api_key, fixture_dir, max_comments)
+
+def get_analysis_backend():
+    """Configured analysis backend: ANALYSIS_BACKEND=cloud (default) or local"""
+    kind = (st.secrets.get("ANALYSIS_BACKEND", os.getenv("ANALYSIS_BACKEND")) or "cloud").lower()
+    if kind == "local":
+        return _local_analysis_backend(
+            st.secrets.get("YOUTUBE_API_KEY", os.getenv("YOUTUBE_API_KEY")),
+            st.secrets.get("LOCAL_COMMENTS_DIR", os.getenv("LOCAL_COMMENTS_DIR")),
+            int(st.secrets.get("LOCAL_MAX_COMMENTS", os.getenv("LOCAL_MAX_COMMENTS", "20000"))),
+            int(st.secrets.get("LOCAL_WORKERS", os.getenv("LOCAL_WORKERS", "2"))),
+        )
+    return CloudFunctionBackend(
+        st.secrets.get("COMMENTS_FUNC_URL", os.getenv("COMMENTS_FUNC_URL")),
+        st.secrets.get("RESULTS_BUCKET", os.getenv("RESULTS_BUCKET")),
+        session=get_function_session(),
+    )
+
+# ─── Job Registry ────────────────────────────────────────────────────────────
+# An in-flight job older than this is presumed dead and may be claimed again
+JOB_STALE_SECONDS = 45 * 60
+
+# A forced claim ("Run Fresh Analysis") replaces an in-flight job older than this
+JOB_FORCE_GRACE_SECONDS = 10 * 60
+
+# Completed results are never served once older than this, fingerprint or not
+JOB_RESULT_MAX_AGE_SECONDS = int(st.secrets.get("JOB_RESULT_MAX_AGE", os.getenv("JOB_RESULT_MAX_AGE", str(24 * 3600))))
+
+# A result still stands while the video's comment count moved by at most
+# max(FINGERPRINT_MIN_CHANGE, FINGERPRINT_CHANGE_RATIO * count) since its run
+FINGERPRINT_CHANGE_RATIO = float(st.secrets.get("FINGERPRINT_CHANGE_RATIO", os.getenv("FINGERPRINT_CHANGE_RATIO", "0.05")))
+FINGERPRINT_MIN_CHANGE = 20
+
+# How long a fetched fingerprint is trusted before asking the API again
+FINGERPRINT_TTL_SECONDS = 300
+
+# Registry rows are deleted after this long
+JOB_RETENTION_SECONDS = 7 * 24 * 3600
+
+class CommentFingerprinter:
+    """Cheap summary of a video's comment set: comment count plus newest comment time.
+
+    Costs one videos.list and one commentThreads.list call (run concurrently),
+    cached for FINGERPRINT_TTL_SECONDS. Returns None when the API cannot be
+    reached, in which case result age alone decides reuse.
+    """
+
+    def __init__(self, client, cache, connections, executor):
+        self.client = client
+        self.cache = cache
+        self.connections = connections
+        self.executor = executor
+
+    def _latest_comment_at(self, video_id):
+        request = self.client.commentThreads().list(
+            part="snippet", videoId=video_id, order="time", maxResults=1, textFormat="plainText"
+        )
+        try:
+            items = youtube_execute(request, connections=self.connections).get("items", [])
+        except Exception:
+            return None  # Comments disabled, or a transient error
+        return items[0]["snippet"]["topLevelComment"]["snippet"]["publishedAt"] if items else None
+
+    def cached(self, video_id):
+        """The video's fingerprint if one was fetched within FINGERPRINT_TTL_SECONDS, else None"""
+        return self.cache.get(["fingerprint", video_id])
+
+    def fingerprint(self, video_id):
+        cached = self.cached(video_id)
+        if cached is not None:
+            return cached
+        
+        latest = self.executor.submit(self._latest_comment_at, video_id)
+        try:
+            resp = youtube_execute(
+                self.client.videos().list(part="statistics", id=video_id), connections=self.connections
+            )
+        except Exception:
+            return None
+        items = resp.get("items", [])
+        statistics = items[0].get("statistics", {}) if items else {}
+        fingerprint = {
+            "comment_count": int(statistics["commentCount"]) if "commentCount" in statistics else None,
+            "latest_comment_at": latest.result(),
+        }
+        self.cache.set(["fingerprint", video_id], fingerprint)
+        return fingerprint
+
+@st.cache_resource(show_spinner=False)
+def get_fingerprint_cache():
+    return TieredCache("fingerprint", maxsize=5000, ttl=FINGERPRINT_TTL_SECONDS, store=get_cache_store())
+
+@st.cache_resource(show_spinner=False)
+def get_fingerprint_executor():
+    """Pool for the fingerprinter's concurrent commentThreads call.
+
+    Separate from the background executor: fingerprint() runs on that pool
+    (submissions, reuse checks) and waits on this subtask, which would
+    deadlock if every background worker were blocked on one queued behind it.
+    """
+    return ThreadPoolExecutor(max_workers=8, thread_name_prefix="yt-fingerprint")
+
+def get_comment_fingerprinter():
+    """Fingerprinter for the configured YouTube key, or None without one"""
+    yt_key = st.secrets.get("YOUTUBE_API_KEY", os.getenv("YOUTUBE_API_KEY"))
+    if not yt_key:
+        return None
+    return CommentFingerprinter(
+        get_youtube_client(yt_key), get_fingerprint_cache(), _youtube_connections(), get_fingerprint_executor()
+    )
+
+def fingerprint_within_threshold(old, new):
+    """Whether the comment set described by `new` is close enough to `old` to reuse its result"""
+    if not old or not new:
+        return True  # Nothing to compare; result age alone decides
+    if old["latest_comment_at"] is not None and old["latest_comment_at"] == new["latest_comment_at"]:
+        return True  # No comment newer than the analysed ones
+    if old["comment_count"] is None or new["comment_count"] is None:
+        return False
+    change = abs(new["comment_count"] - old["comment_count"])
+    return change <= max(FINGERPRINT_MIN_CHANGE, FINGERPRINT_CHANGE_RATIO * old["comment_count"])
+
+def result_is_reusable(job, fingerprint, now=None):
+    """Whether a registry job holds a result that still stands for the video's current comments"""
+    now = time.time() if now is None else now
+    if job["status"] != "complete" or job["updated_at"] <= now - JOB_RESULT_MAX_AGE_SECONDS:
+        return False
+    return fingerprint_within_threshold(job["fingerprint"], fingerprint)
+
+class JobRegistry:
+    """SQLite registry of analysis jobs, one row per video ID.
+
+    Shared by every session and, through the database file, every server
+    process, so it outlives reruns and page reloads. ``claim`` is the only way
+    to start a job: it either records a new run or returns the job to join
+    instead, which keeps two users from paying for the same run. Each run
+    records the comment fingerprint it started from, so later claims can tell
+    whether its result still stands. Whoever
+    fetches the result writes it back with ``complete`` so everyone else can
+    pick it up with ``get``. Rows match a run by its ``started_at``, so late
+    writes from a superseded run are ignored.
+    """
+
+    def __init__(self, path):
+        self._lock = threading.Lock()
+        # Autocommit mode, so claim can take the write lock up front with BEGIN IMMEDIATE
+        self._conn = sqlite3.connect(path, timeout=10, check_same_thread=False, isolation_level=None)
+        with self._lock:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "video_id TEXT PRIMARY KEY, video TEXT NOT NULL, backend TEXT NOT NULL, status TEXT NOT NULL, "
+                "started_at REAL NOT NULL, updated_at REAL NOT NULL, "
+                "result_key TEXT, result_source TEXT, content TEXT, error TEXT, fingerprint TEXT)"
+            )
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+            if "fingerprint" not in columns:
+                self._conn.execute("ALTER TABLE jobs ADD COLUMN fingerprint TEXT")
+            self._conn.execute("DELETE FROM jobs WHERE updated_at < ?", (time.time() - JOB_RETENTION_SECONDS,))
+            # Seconds from start to result per finished run, for completion estimates
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS latencies ("
+                "backend TEXT NOT NULL, bucket INTEGER NOT NULL, seconds REAL NOT NULL, recorded_at REAL NOT NULL)"
+            )
+            self._conn.execute("DELETE FROM latencies WHERE recorded_at < ?", (time.time() - LATENCY_RETENTION_SECONDS,))
+
+    _COLUMNS = ("video_id", "video", "backend", "status", "started_at", "updated_at",
+                "result_key", "result_source", "content", "error", "fingerprint")
+
+    def _get(self, video_id):
+        row = self._conn.execute(
+            f"SELECT {', '.join(self._COLUMNS)} FROM jobs WHERE video_id = ?", (video_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        job = dict(zip(self._COLUMNS, row))
+        job["video"] = json.loads(job["video"])
+        job["fingerprint"] = json.loads(job["fingerprint"]) if job["fingerprint"] else None
+        job["result"] = None
+        if job["status"] == "complete":
+            key = json.loads(job["result_key"])
+            job["result"] = AnalysisResult(tuple(key) if isinstance(key, list) else key, job["result_source"], job["content"])
+        return job
+
+    def get(self, video_id):
+        """The video's job as a dict (``result`` is an AnalysisResult once complete), or None"""
+        with self._lock:
+            return self._get(video_id)
+
+    def claim(self, video, backend_name, force=False, fingerprint=None):
+        """Start a job unless one can be joined; returns (claimed, job).
+
+        An in-flight job is joined, unless `force` is set and it started more
+        than JOB_FORCE_GRACE_SECONDS ago. A complete job is returned unless
+        `force` is set or its result no longer stands for `fingerprint`, the
+        video's current comment fingerprint.
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                job = self._get(video["video_id"])
+                if job is not None:
+                    grace = JOB_FORCE_GRACE_SECONDS if force else JOB_STALE_SECONDS
+                    in_flight = job["status"] == "processing" and job["started_at"] > now - grace
+                    if in_flight or (not force and result_is_reusable(job, fingerprint, now)):
+                        self._conn.execute("COMMIT")
+                        return False, job
+                
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO jobs (video_id, video, backend, status, started_at, updated_at, fingerprint) "
+                    "VALUES (?, ?, ?, 'processing', ?, ?, ?)",
+                    (video["video_id"], json.dumps(video), backend_name, now, now,
+                     json.dumps(fingerprint) if fingerprint else None),
+                )
+                job = self._get(video["video_id"])
+                self._conn.execute("COMMIT")
+                return True, job
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def complete(self, video_id, started_at, result):
+        """Record the run's result; the first completion also records its latency, when known"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                job = self._get(video_id)
+                self._conn.execute(
+                    "UPDATE jobs SET status = 'complete', updated_at = ?, result_key = ?, result_source = ?, content = ?, "
+                    "error = NULL WHERE video_id = ? AND started_at = ?",
+                    (now, json.dumps(result.key), result.source, result.content, video_id, started_at),
+                )
+                landed = result_landed_at(result, started_at, now)
+                first = job is not None and job["started_at"] == started_at and job["status"] == "processing"
+                if first and landed is not None:
+                    self._conn.execute(
+                        "INSERT INTO latencies (backend, bucket, seconds, recorded_at) VALUES (?, ?, ?, ?)",
+                        (job["backend"], latency_bucket(job_comment_count(job)), landed - started_at, now),
+                    )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def fail(self, video_id, started_at, message):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = 'error', updated_at = ?, error = ? "
+                "WHERE video_id = ? AND started_at = ? AND status = 'processing'",
+                (time.time(), message, video_id, started_at),
+            )
+
+    def latency_samples(self, backend_name, bucket=None, limit=None):
+        """Latencies in seconds of the most recent finished runs, optionally of one bucket"""
+        query = "SELECT seconds FROM latencies WHERE backend = ?"
+        params = [backend_name]
+        if bucket is not None:
+            query += " AND bucket = ?"
+            params.append(bucket)
+        query += " ORDER BY recorded_at DESC LIMIT ?"
+        params.append(limit or LATENCY_SAMPLES)
+        with self._lock:
+            return [row[0] for row in self._conn.execute(query, params)]
+
+@st.cache_resource(show_spinner=False)
+def get_job_registry():
+    """One registry connection per process; the database file is shared across processes"""
+    return JobRegistry(CACHE_DB_PATH)
+
+# ─── Completion Estimates ────────────────────────────────────────────────────
+# Finished runs are bucketed by comment count in decades (up to 9, 99, 999, ...
+# comments). A bucket predicts from its LATENCY_SAMPLES most recent runs once it
+# has LATENCY_MIN_SAMPLES, otherwise all of the backend's runs are used, and
+# before any run has been measured DEFAULT_LATENCY_ESTIMATE is
+LATENCY_SAMPLES = 50
+LATENCY_MIN_SAMPLES = 3
+LATENCY_RETENTION_SECONDS = 30 * 24 * 3600
+
+# early (25th percentile), typical (median) and late (90th percentile) finish
+LatencyEstimate = namedtuple("LatencyEstimate", ["early", "typical", "late", "samples"])
+DEFAULT_LATENCY_ESTIMATE = LatencyEstimate(45, 150, 330, 0)
+
+# When results must be polled: the first check after POLL_FIRST_SECONDS, then
+# doubling gaps up to the early estimate, about POLL_WINDOW_CHECKS evenly spaced
+# checks (at least POLL_DENSE_SECONDS apart) up to the late estimate, then
+# doubling gaps again, never more than POLL_MAX_INTERVAL_SECONDS apart
+POLL_FIRST_SECONDS = 15
+POLL_DENSE_SECONDS = 10
+POLL_WINDOW_CHECKS = 8
+POLL_MAX_INTERVAL_SECONDS = 120
+
+def latency_bucket(comment_count):
+    """Decade bucket of a comment count: digits in the count, 0 when unknown"""
+    return len(str(max(comment_count, 1))) if comment_count is not None else 0
+
+def job_comment_count(job):
+    """Comment count a registry job started from, if known"""
+    fingerprint = job.get("fingerprint") or {}
+    if fingerprint.get("comment_count") is not None:
+        return fingerprint["comment_count"]
+    return job["video"].get("comment_count")
+
+def result_landed_at(result, started_at, now):
+    """When a result was written, as closely as it can be told, or None
+
+    A GCS result key carries the object generation, which is its creation
+    time in microseconds, so polling delay doesn't count as pipeline latency;
+    an object written before `started_at` is an earlier run's and gives None,
+    so it is never recorded as this run's latency. Other results are taken to
+    have landed when they were picked up.
+    """
+    key = result.key
+    if isinstance(key, tuple) and len(key) == 2 and isinstance(key[1], int):
+        landed = key[1] / 1e6
+        return min(landed, now) if landed >= started_at else None
+    return now
+
+@st.cache_resource(show_spinner=False)
+def get_latency_estimates():
+    """Estimates by (backend, bucket), recomputed from the registry once a minute"""
+    return TieredCache("latency_estimates", maxsize=64, ttl=60)
+
+def estimate_latency(backend_name, comment_count):
+    """LatencyEstimate for a run of `backend_name` on a video with `comment_count` comments"""
+    bucket = latency_bucket(comment_count)
+    cache = get_latency_estimates()
+    estimate = cache.get([backend_name, bucket])
+    if estimate is None:
+        registry = get_job_registry()
+        samples = registry.latency_samples(backend_name, bucket)
+        if len(samples) < LATENCY_MIN_SAMPLES:
+            samples = registry.latency_samples(backend_name)
+        if len(samples) < LATENCY_MIN_SAMPLES:
+            estimate = DEFAULT_LATENCY_ESTIMATE
+        else:
+            cuts = statistics.quantiles(samples, n=20, method="inclusive")
+            estimate = LatencyEstimate(cuts[4], cuts[9], cuts[17], len(samples))
+        cache.set([backend_name, bucket], estimate)
+    return estimate
+
+def next_check_at(last_check, estimate):
+    """Elapsed seconds at which to poll for the result next, given the last poll's"""
+    if last_check < estimate.early:
+        return min(max(last_check * 2, POLL_FIRST_SECONDS), estimate.early)
+    if last_check < estimate.late:
+        step = max((estimate.late - estimate.early) / POLL_WINDOW_CHECKS, POLL_DENSE_SECONDS)
+        return min(last_check + step, estimate.late)
+    overdue = last_check - estimate.late
+    return last_check + min(max(overdue, POLL_DENSE_SECONDS), POLL_MAX_INTERVAL_SECONDS)
+
+def result_check_due(elapsed, last_check, estimate, notifier):
+    """Whether to poll for a result no notification has announced yet"""
+    if notifier is not None and notifier.alive() and notifier.delivers_all:
+        return elapsed - last_check >= NOTIFIER_FALLBACK_POLL_SECONDS
+    return elapsed >= next_check_at(last_check, estimate)
+
+# ─── Batch Analysis Queue ────────────────────────────────────────────────────
+# Analyses in flight at once across all batch jobs in this process
+BATCH_CONCURRENCY = int(st.secrets.get("BATCH_CONCURRENCY", os.getenv("BATCH_CONCURRENCY", "4")))
+
+# Attempts per job when quota errors keep coming back
+BATCH_MAX_ATTEMPTS = 5
+
+# First backoff after a quota error, doubled per attempt up to the cap, with jitter
+BATCH_BACKOFF_SECONDS = 30
+BATCH_BACKOFF_CAP_SECONDS = 600
+
+# How long a job may run before its worker gives up on it
+BATCH_JOB_TIMEOUT_SECONDS = 45 * 60
+
+BATCH_FINISHED_STATUSES = ("complete", "error")
+
+# Finished jobs (with their results) stay in memory for the queue view this long
+BATCH_JOB_RETENTION_SECONDS = 6 * 3600
+
+class AnalysisQueue:
+    """Process-wide scheduler for batch analyses, at most `concurrency` in flight.
+
+    Each worker thread owns one job from trigger to result: it claims the
+    video in the job registry (joining a run already in flight, or taking a
+    recent result), submits it (backing off on quota errors), then waits for
+    the result through the notifier or by polling the backend. Every job goes through the same
+    backend and notifier objects, so all of them share this process's GCS
+    and HTTP connection pools. Jobs are plain dicts; ``jobs`` hands out
+    copies for the queue view. Finished jobs are evicted once a session
+    clears them with ``forget`` or after BATCH_JOB_RETENTION_SECONDS.
+    """
+
+    def __init__(self, concurrency, registry):
+        self.executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="batch-analysis")
+        self.registry = registry
+        self._lock = threading.Lock()
+        self._jobs = {}
+
+    def enqueue(self, videos, backend, notifier=None, fingerprinter=None):
+        """Queue one job per video; returns their job IDs"""
+        job_ids = []
+        for video in videos:
+            job = {
+                "job_id": hashlib.sha256(f"{video['video_id']}#{time.time_ns()}".encode("utf-8")).hexdigest()[:12],
+                "video": video,
+                "status": "queued",
+                "message": "",
+                "attempts": 0,
+                "queued_at": time.time(),
+                "started_at": None,
+                "finished_at": None,
+                "result": None,
+            }
+            with self._lock:
+                self._jobs[job["job_id"]] = job
+            self.executor.submit(self._run, job["job_id"], backend, notifier, fingerprinter)
+            job_ids.append(job["job_id"])
+        self._prune()
+        return job_ids
+
+    def jobs(self, job_ids):
+        self._prune()
+        with self._lock:
+            return [dict(self._jobs[job_id]) for job_id in job_ids if job_id in self._jobs]
+
+    def forget(self, job_ids):
+        """Evict the given jobs that have finished; unfinished ones are kept for their workers"""
+        with self._lock:
+            for job_id in job_ids:
+                if job_id in self._jobs and self._jobs[job_id]["status"] in BATCH_FINISHED_STATUSES:
+                    del self._jobs[job_id]
+
+    def _prune(self):
+        """Evict jobs that finished more than BATCH_JOB_RETENTION_SECONDS ago"""
+        cutoff = time.time() - BATCH_JOB_RETENTION_SECONDS
+        with self._lock:
+            expired = [
+                job_id for job_id, job in self._jobs.items()
+                if job["status"] in BATCH_FINISHED_STATUSES and job["finished_at"] < cutoff
+            ]
+            for job_id in expired:
+                del self._jobs[job_id]
+
+    def _update(self, job_id, **changes):
+        with self._lock:
+            self._jobs[job_id].update(changes)
+
+    def _run(self, job_id, backend, notifier, fingerprinter):
+        with self._lock:
+            video = self._jobs[job_id]["video"]
+        video_id = video["video_id"]
+        
+        # A result that already exists is not this job's; wait for a newer one
+        try:
+            previous = backend.fetch_result(video_id)
+        except Exception:
+            previous = None
+        seen = previous.key if previous else None
+        
+        attempts = 0
+        while True:
+            attempts += 1
+            claimed = False
+            try:
+                fingerprint = fingerprinter.fingerprint(video_id) if fingerprinter is not None else None
+                claimed, entry = self.registry.claim(video, backend.name, fingerprint=fingerprint)
+                if not claimed and entry["status"] == "complete":
+                    self._update(job_id, status="complete", result=entry["result"], attempts=attempts,
+                                 message="Shared result from an earlier run", finished_at=time.time())
+                    return
+                
+                started_at = entry["started_at"]
+                if claimed:
+                    self._update(job_id, status="submitting", message=backend.submit_stage, attempts=attempts)
+                    try:
+                        backend.submit(video_id)
+                    except requests.exceptions.ReadTimeout:
+                        pass  # As with single analyses, the function may still be running
+                message = "" if claimed else "Joined a run already in progress"
+                self._update(job_id, status="processing", message=message, started_at=started_at, attempts=attempts)
+                result = self._wait(video_id, backend, notifier, seen, started_at)
+                self.registry.complete(video_id, started_at, result)
+                self._update(job_id, status="complete", result=result, finished_at=time.time())
+                return
+            except Exception as e:
+                try:
+                    if claimed:
+                        self.registry.fail(video_id, started_at, str(e))
+                except Exception:
+                    logger.exception("Could not release the registry claim for %s", video_id)
+                if not is_quota_error(e) or attempts >= BATCH_MAX_ATTEMPTS:
+                    self._update(job_id, status="error", message=str(e), finished_at=time.time())
+                    return
+                delay = min(BATCH_BACKOFF_SECONDS * 2 ** (attempts - 1), BATCH_BACKOFF_CAP_SECONDS)
+                delay *= random.uniform(0.5, 1.0)
+                self._update(job_id, status="backoff", message=f"Quota exceeded, retrying in {delay:.0f}s")
+                time.sleep(delay)
+
+    def _wait(self, video_id, backend, notifier, seen, started_at):
+        """Block this worker until the run starting at `started_at` has a result.
+
+        The result comes from the backend or, when another session or process
+        fetched it first, from the registry.
+        """
+        if backend.cheap_poll:
+            notifier = None
+        else:
+            # Results that must be polled are checked on the same schedule as the dashboard's
+            entry = self.registry.get(video_id)
+            estimate = estimate_latency(backend.name, job_comment_count(entry) if entry is not None else None)
+        last_poll = 0  # seconds into the run
+        while time.time() - started_at < BATCH_JOB_TIMEOUT_SECONDS:
+            entry = self.registry.get(video_id)
+            if entry is not None and entry["started_at"] == started_at:
+                if entry["status"] == "complete":
+                    return entry["result"]
+                if entry["status"] == "error":
+                    raise AnalysisFailedError(entry["error"])
+            
+            blob_name = notifier.latest(video_id, since=started_at) if notifier is not None else None
+            elapsed = time.time() - started_at
+            if backend.cheap_poll:
+                due = elapsed >= last_poll + STATUS_REFRESH_SECONDS
+            else:
+                due = result_check_due(elapsed, last_poll, estimate, notifier)
+            if blob_name or due:
+                last_poll = elapsed
+                result = backend.fetch_result(video_id, blob_name=blob_name, seen=seen, since=started_at)
+                if result is not None and result.content and len(result.content.strip()) > 50:
+                    return result
+            time.sleep(STATUS_REFRESH_SECONDS)
+        raise AnalysisFailedError(f"No result after {BATCH_JOB_TIMEOUT_SECONDS // 60} minutes")
+
+@st.cache_resource
+def get_analysis_queue():
+    """One batch scheduler per process, shared by all sessions"""
+    return AnalysisQueue(BATCH_CONCURRENCY, get_job_registry())
 
 # ─── Enhanced Loading Animation ──────────────────────────────────────────────
 def show_loading_animation(text="Processing", stage=""):
@@ -917,16 +1886,29 @@ def show_loading_animation(text="Processing", stage=""):
         <div style="font-size: 18px; margin-bottom: 5px; color: #ffffff; font-weight: 600; text-shadow: 1px 1px 2px rgba(0,0,0,0.5);">{text}</div>
         {f'<div style="margin-top: 10px; color: #e0e0e0; font-size: 0.9em; font-weight: 500; text-shadow: 1px 1px 2px rgba(0,0,0,0.5);">{stage}</div>' if stage else ''}
     </div>
-    
-    <style>
-    @keyframes spin {{
-        0% {{ transform: rotate(0deg); }}
-        100% {{ transform: rotate(360deg); }}
-    }}
-    </style>
     """
     return st.markdown(loading_html, unsafe_allow_html=True)
 
+# ─── Status Notices ──────────────────────────────────────────────────────────
+# Short-lived status messages ("Found 25 videos!") kept in session state with an
+# expiry, so showing one never means sleeping on the script thread. Each is shown
+# by render_notices for its area on every render until it expires.
+NOTICE_SECONDS = 4
+
+Notice = namedtuple("Notice", ["area", "kind", "message", "expires_at"])
+
+def notify(area, message, kind="success", seconds=NOTICE_SECONDS):
+    """Queue a status-<kind> message for the next renders of `area`"""
+    st.session_state.notices.append(Notice(area, kind, message, time.time() + seconds))
+
+def render_notices(area):
+    """Show the unexpired notices for `area`; expired ones are dropped"""
+    now = time.time()
+    st.session_state.notices = [notice for notice in st.session_state.notices if notice.expires_at > now]
+    for notice in st.session_state.notices:
+        if notice.area == area:
+            st.markdown(f'<div class="status-{notice.kind}">{notice.message}</div>', unsafe_allow_html=True)
+
 # ─── Enhanced Header ──────────────────────────────────────────────────────────
 def show_header():
     youtube_logo_url = "https://cdn-icons-png.flaticon.com/512/1384/1384060.png"
@@ -949,52 +1931,55 @@ def search_interface():
     </div>
     ''', unsafe_allow_html=True)
     
-    # Search form
-    # Add alignment CSS
-    st.markdown("""
-    <style>
-    .search-row {
-        display: flex;
-        align-items: end;
-        gap: 15px;
-        margin-bottom: 20px;
-    }
-    .search-input {
-        flex: 4;
-    }
-    .search-select {
-        flex: 1;
-    }
-    .search-button {
-        flex: 1;
-    }
-    </style>
-    """, unsafe_allow_html=True)
-
+    # Search form (alignment classes come from the theme stylesheet)
     col1, col2, col3 = st.columns([4, 1, 1])
 
     with col1:
         query = st.text_input("", key="search_query", placeholder="Enter keywords to search YouTube videos...")
 
     with col2:
-        max_results = st.selectbox("Results", [10, 25, 50], key="search_max")
+        max_results = st.selectbox("Results", [10, 25, 50, 100, 200, 500], key="search_max")
 
     with col3:
         st.markdown("<div style='height: 8px;'></div>", unsafe_allow_html=True)  # Add spacing
         search_clicked = st.button("🔍 Search", use_container_width=True)
     
+    with st.expander("Filters"):
+        fcol1, fcol2 = st.columns(2)
+        with fcol1:
+            region = st.selectbox("Region", ["Any", "IN", "US", "GB", "CA", "AU"], key="search_region")
+        with fcol2:
+            language = st.selectbox("Language", ["Any", "en", "hi"], key="search_language")
+    
     st.markdown('</div>', unsafe_allow_html=True)
     
+    if st.session_state.batch_jobs:
+        if st.button(f"📋 View Batch Queue ({len(st.session_state.batch_jobs)} jobs)", key="open_queue"):
+            st.session_state.queue_mode = True
+            st.rerun()
+    
     if search_clicked:
         if not query.strip():
             st.markdown('<div class="status-error">⚠️ Please enter a search query.</div>', unsafe_allow_html=True)
         else:
-            perform_search(query, max_results)
+            perform_search(
+                query,
+                max_results,
+                region_code=None if region == "Any" else region,
+                relevance_language=None if language == "Any" else language,
+            )
+    render_notices("search")
+    
+    stats = get_search_cache().stats()
+    st.caption(
+        f"Search cache: {stats['memory_hits'] + stats['disk_hits']} hits "
+        f"({stats['disk_hits']} from disk) • {stats['misses']} misses • {stats['hit_rate']:.0%} hit rate"
+    )
     
     display_search_results()
 
-def perform_search(query, max_results):
-    """Enhanced search with better error handling"""
+def perform_search(query, max_results, region_code=None, relevance_language=None):
+    """Start a paginated search; the first page is loaded here, the rest on demand"""
     placeholder = st.empty()
     with placeholder.container():
         show_loading_animation("Searching YouTube videos", "Connecting to YouTube API...")
@@ -1004,37 +1989,46 @@ def perform_search(query, max_results):
         placeholder.markdown('<div class="status-error">❌ YouTube API key missing.</div>', unsafe_allow_html=True)
         return
     
+    params = {"q": query, "part": "snippet", "type": "video", "maxResults": min(max_results, SEARCH_PAGE_SIZE)}
+    if region_code:
+        params["regionCode"] = region_code
+    if relevance_language:
+        params["relevanceLanguage"] = relevance_language
+    
     try:
-        yt = build("youtube", "v3", developerKey=yt_key)
-        resp = yt.search().list(
-            q=query, 
-            part="snippet", 
-            type="video", 
-            maxResults=max_results
-        ).execute()
+        client = get_youtube_client(yt_key)
+        connections = _youtube_connections()
+        executor = get_background_executor()
+        enricher = VideoEnricher(client, get_video_stats_cache(), connections, executor)
+        pager = SearchPager(client, get_search_cache(), connections, executor, params, max_results, enricher=enricher)
+        first_page = pager.page(0) or []
+        st.session_state.search_pager = pager
+        st.session_state.search_page = 0
         
-        st.session_state.search_results = [
-            {
-                "video_id": item["id"]["videoId"],
-                "title": item["snippet"]["title"],
-                "channel": item["snippet"]["channelTitle"],
-                "published": item["snippet"]["publishedAt"][:10],
-                "thumbnail": item["snippet"]["thumbnails"]["medium"]["url"],
-                "description": item["snippet"]["description"]
-            }
-            for item in resp["items"]
-        ]
-        
-        placeholder.markdown(f'<div class="status-success">✅ Found {len(st.session_state.search_results)} videos!</div>', unsafe_allow_html=True)
-        time.sleep(1)
         placeholder.empty()
+        if pager.last_from_cache:
+            notify("search", f"⚡ Found {len(first_page)} videos (cached)")
+        else:
+            notify("search", f"✅ Found {len(first_page)} videos!")
         
     except Exception as e:
         placeholder.markdown(f'<div class="status-error">❌ Search failed: {str(e)}</div>', unsafe_allow_html=True)
 
+# Cards rendered per results page; the rest are fetched and rendered on demand
+RESULTS_WINDOW_SIZE = 10
+
+@st.fragment
 def display_search_results():
-    """Enhanced search results display"""
-    if st.session_state.search_results:
+    """Enhanced search results display, rendering one fixed-size window of cards.
+
+    Runs as a fragment so paging only re-sends the current window.
+    """
+    pager = st.session_state.search_pager
+    if pager is not None:
+        page = st.session_state.search_page
+        start = page * RESULTS_WINDOW_SIZE
+        end = start + RESULTS_WINDOW_SIZE
+        found = pager.limit if pager.total_estimate is None else min(pager.limit, pager.total_estimate)
         # Display count outside the container with better styling
         st.markdown(f'''
         <div style="
@@ -1050,105 +2044,270 @@ def display_search_results():
             backdrop-filter: blur(10px);
             border: 1px solid rgba(255,255,255,0.2);
         ">
-            📺 Found {len(st.session_state.search_results)} Videos
+            📺 Found {found} Videos • Showing {start + 1}–{min(end, found)}
         </div>
         ''', unsafe_allow_html=True)
         
-        for i, video in enumerate(st.session_state.search_results):
-            st.markdown(f'''
-            <div class="video-card" style="animation: fadeInUp {(i+1)*0.2}s ease-out;">
-            ''', unsafe_allow_html=True)
-            
-            cols = st.columns([1, 4, 1])
-            
-            with cols[0]:
-                # Enhanced thumbnail with modern hover effects
-                st.markdown(f'''
-                <div class="thumbnail-container">
-                    <div class="thumbnail-wrapper">
-                        <img src="{video['thumbnail']}" alt="{video['title']}">
-                        <div class="play-button">
-                            <svg width="24" height="24" viewBox="0 0 24 24" fill="none" xmlns="http://www.w3.org/2000/svg">
-                                <path d="M8 5V19L19 12L8 5Z" fill="white"/>
-                            </svg>
-                        </div>
-                        <div class="duration-badge">HD</div>
-                    </div>
+        selection = st.session_state.batch_selection
+        if selection:
+            bcol1, bcol2, bcol3 = st.columns([3, 2, 1])
+            with bcol1:
+                st.markdown(f"<div style='color: white; font-weight: 600; padding-top: 8px;'>🧺 {len(selection)} videos selected for batch analysis</div>", unsafe_allow_html=True)
+            with bcol2:
+                if st.button(f"🚀 Analyze {len(selection)} Videos", key="start_batch", use_container_width=True):
+                    start_batch_analysis(list(selection.values()))
+            with bcol3:
+                if st.button("Clear", key="clear_batch", use_container_width=True):
+                    clear_batch_selection()
+                    st.rerun(scope="fragment")
+        
+        try:
+            render_result_cards(islice(pager.iter_results(end), start, None), start)
+        except Exception as e:
+            st.markdown(f'<div class="status-error">❌ Could not load more results: {str(e)}</div>', unsafe_allow_html=True)
+        
+        nav1, nav2, nav3 = st.columns([1, 2, 1])
+        with nav1:
+            if st.button("← Previous", key="results_prev", use_container_width=True, disabled=page == 0):
+                st.session_state.search_page = page - 1
+                st.rerun(scope="fragment")
+        with nav2:
+            st.markdown(f"<div style='text-align: center; color: white; font-weight: 600; padding-top: 8px;'>Page {page + 1}</div>", unsafe_allow_html=True)
+        with nav3:
+            if st.button("Next →", key="results_next", use_container_width=True, disabled=not pager.has_more(end)):
+                st.session_state.search_page = page + 1
+                st.rerun(scope="fragment")
+
+@st.cache_data(max_entries=2048, show_spinner=False)
+def video_card_html(video):
+    """Thumbnail and content HTML for one result card, templated once per video"""
+    stats_html = ""
+    if "view_count" in video:
+        comments = video["comment_count"]
+        stats_html = (
+            f'<div class="meta-item secondary">👁️ {format_count(video["view_count"])} views</div>'
+            + (f'<div class="meta-item secondary">💬 {format_count(comments)} comments</div>'
+               if comments is not None else '<div class="meta-item secondary">🚫 Comments disabled</div>')
+        )
+    
+    # Enhanced thumbnail with modern hover effects
+    thumbnail_html = f'''
+    <div class="thumbnail-container">
+        <div class="thumbnail-wrapper">
+            <img src="{video['thumbnail']}" alt="{video['title']}">
+            <div class="play-button">
+                <svg width="24" height="24" viewBox="0 0 24 24" fill="none" xmlns="http://www.w3.org/2000/svg">
+                    <path d="M8 5V19L19 12L8 5Z" fill="white"/>
+                </svg>
+            </div>
+            <div class="duration-badge">{format_duration(video.get("duration")) or "HD"}</div>
+        </div>
+    </div>
+    '''
+    
+    description = video.get("description", "")
+    description_html = ""
+    if description:
+        description_html = f'''
+        <div class="description-container">
+            <div class="description-content">
+                <div class="description-icon">
+                    <svg width="20" height="20" viewBox="0 0 24 24" fill="#0066FF">
+                        <path d="M14 17H4v2h10v-2zm6-8H4v2h16V9zM4 15h16v-2H4v2zM4 5v2h16V5H4z"/>
+                    </svg>
                 </div>
-                ''', unsafe_allow_html=True)
-            
-            with cols[1]:
-                # Enhanced content section with better typography and colors
-                st.markdown(f'''
-                <div class="video-content">
-                    <h3 class="video-title">
-                        {video["title"]}
-                        <span class="verified-badge">
-                            <svg width="16" height="16" viewBox="0 0 24 24" fill="#1DA1F2">
-                                <path d="M9 16.17L4.83 12l-1.42 1.41L9 19 21 7l-1.41-1.41L9 16.17z"/>
-                            </svg>
-                        </span>
-                    </h3>
-                    
-                    <div class="video-meta">
-                        <div class="meta-item primary">
-                            <svg width="16" height="16" viewBox="0 0 24 24" fill="currentColor">
-                                <path d="M12 2C6.48 2 2 6.48 2 12s4.48 10 10 10 10-4.48 10-10S17.52 2 12 2zm0 3c1.66 0 3 1.34 3 3s-1.34 3-3 3-3-1.34-3-3 1.34-3 3-3z"/>
-                            </svg>
-                            {video["channel"]}
-                        </div>
-                        <div class="meta-item secondary">
-                            <svg width="16" height="16" viewBox="0 0 24 24" fill="currentColor">
-                                <path d="M11.99 2C6.47 2 2 6.48 2 12s4.47 10 9.99 10C17.52 22 22 17.52 22 12S17.52 2 11.99 2zM12 20c-4.42 0-8-3.58-8-8s3.58-8 8-8 8 3.58 8 8-3.58 8-8 8z"/>
-                                <path d="M12.5 7H11v6l5.25 3.15.75-1.23-4.5-2.67z"/>
-                            </svg>
-                            {video["published"]}
-                        </div>
-                    </div>
-                ''', unsafe_allow_html=True)
-                
-                description = video.get("description", "")
-                if description:
-                    st.markdown(f'''
-                    <div class="description-container">
-                        <div class="description-content">
-                            <div class="description-icon">
-                                <svg width="20" height="20" viewBox="0 0 24 24" fill="#0066FF">
-                                    <path d="M14 17H4v2h10v-2zm6-8H4v2h16V9zM4 15h16v-2H4v2zM4 5v2h16V5H4z"/>
-                                </svg>
-                            </div>
-                            <p class="description-text">
-                                {description[:250] + ('...' if len(description) > 250 else '')}
-                            </p>
-                        </div>
-                    </div>
-                    ''', unsafe_allow_html=True)
-                
-                st.markdown('</div>', unsafe_allow_html=True)
-            
-            st.markdown('</div>', unsafe_allow_html=True)
-            
-            with cols[2]:
-                if st.button("🚀 Analyze", key=f"select_{i}", use_container_width=True):
-                    st.session_state.selected_video = video
-                    st.session_state.search_results = []
-                    st.session_state.dashboard_mode = True
-                    st.session_state.raw_summary = None
-                    st.session_state.ai_insights = None
-                    st.session_state.analysis_status = "idle"
-                    st.rerun()
+                <p class="description-text">
+                    {description[:250] + ('...' if len(description) > 250 else '')}
+                </p>
+            </div>
+        </div>
+        '''
+    
+    # Enhanced content section with better typography and colors
+    content_html = f'''
+    <div class="video-content">
+        <h3 class="video-title">
+            {video["title"]}
+            <span class="verified-badge">
+                <svg width="16" height="16" viewBox="0 0 24 24" fill="#1DA1F2">
+                    <path d="M9 16.17L4.83 12l-1.42 1.41L9 19 21 7l-1.41-1.41L9 16.17z"/>
+                </svg>
+            </span>
+        </h3>
+        
+        <div class="video-meta">
+            <div class="meta-item primary">
+                <svg width="16" height="16" viewBox="0 0 24 24" fill="currentColor">
+                    <path d="M12 2C6.48 2 2 6.48 2 12s4.48 10 10 10 10-4.48 10-10S17.52 2 12 2zm0 3c1.66 0 3 1.34 3 3s-1.34 3-3 3-3-1.34-3-3 1.34-3 3-3z"/>
+                </svg>
+                {video["channel"]}
+            </div>
+            <div class="meta-item secondary">
+                <svg width="16" height="16" viewBox="0 0 24 24" fill="currentColor">
+                    <path d="M11.99 2C6.47 2 2 6.48 2 12s4.47 10 9.99 10C17.52 22 22 17.52 22 12S17.52 2 11.99 2zM12 20c-4.42 0-8-3.58-8-8s3.58-8 8-8 8 3.58 8 8-3.58 8-8 8z"/>
+                    <path d="M12.5 7H11v6l5.25 3.15.75-1.23-4.5-2.67z"/>
+                </svg>
+                {video["published"]}
+            </div>
+            {stats_html}
+        </div>
+        {description_html}
+    </div>
+    '''
+    return thumbnail_html, content_html
+
+def render_result_cards(videos, first_index=0):
+    """Render one card per video as the iterable yields them, two markdown blocks per card"""
+    for i, video in enumerate(videos, start=first_index):
+        thumbnail_html, content_html = video_card_html(video)
+        st.markdown(f'<div class="video-card" style="animation: fadeInUp {(i % RESULTS_WINDOW_SIZE + 1)*0.2}s ease-out;"></div>', unsafe_allow_html=True)
+        
+        cols = st.columns([1, 4, 1])
+        with cols[0]:
+            st.markdown(thumbnail_html, unsafe_allow_html=True)
+        
+        with cols[1]:
+            st.markdown(content_html, unsafe_allow_html=True)
+        
+        with cols[2]:
+            comments_disabled = "view_count" in video and video["comment_count"] is None
+            if st.button("🚀 Analyze", key=f"select_{i}", use_container_width=True, disabled=comments_disabled):
+                st.session_state.selected_video = video
+                st.session_state.search_pager = None
+                st.session_state.dashboard_mode = True
+                st.session_state.raw_summary = None
+                st.session_state.ai_insights = None
+                st.session_state.analysis_status = "idle"
+                st.rerun()
             
-            st.markdown('</div>', unsafe_allow_html=True)
+            st.checkbox(
+                "Add to batch", key=f"batch_pick_{i}_{video['video_id']}", disabled=comments_disabled,
+                value=video['video_id'] in st.session_state.batch_selection,
+                on_change=toggle_batch_selection, args=(video,),
+            )
+
+def toggle_batch_selection(video):
+    selection = st.session_state.batch_selection
+    if selection.pop(video['video_id'], None) is None:
+        selection[video['video_id']] = video
+
+def clear_batch_selection():
+    for key in [key for key in st.session_state if str(key).startswith("batch_pick_")]:
+        del st.session_state[key]
+    st.session_state.batch_selection = {}
+
+def start_batch_analysis(videos):
+    """Queue every selected video and switch to the queue view"""
+    backend = get_analysis_backend()
+    missing = backend.missing_config()
+    if missing:
+        st.markdown(f'<div class="status-error">❌ {missing}</div>', unsafe_allow_html=True)
+        return
+    
+    notifier = None if backend.cheap_poll else get_result_notifier()
+    st.session_state.batch_jobs.extend(
+        get_analysis_queue().enqueue(videos, backend, notifier, get_comment_fingerprinter())
+    )
+    clear_batch_selection()
+    st.session_state.queue_mode = True
+    st.rerun()
+
+# ─── Batch Queue Interface ───────────────────────────────────────────────────
+BATCH_STATUS_LABELS = {
+    "queued": "⏳ Queued",
+    "submitting": "📤 Submitting",
+    "processing": "🔄 Processing",
+    "backoff": "⏸️ Backing off",
+    "complete": "✅ Complete",
+    "error": "❌ Failed",
+}
+
+def queue_interface():
+    if st.button("← Back to Search", key="queue_back"):
+        st.session_state.queue_mode = False
+        st.rerun()
+    
+    st.markdown("---")
+    
+    jobs = get_analysis_queue().jobs(st.session_state.batch_jobs)
+    if not jobs:
+        st.markdown('<div class="status-processing">📋 No batch jobs yet. Tick "Add to batch" on search results to queue several videos.</div>', unsafe_allow_html=True)
+        return
+    
+    if all(job["status"] in BATCH_FINISHED_STATUSES for job in jobs):
+        render_batch_jobs(jobs)
+        if st.button("🧹 Clear Finished Jobs", key="clear_jobs"):
+            get_analysis_queue().forget(st.session_state.batch_jobs)
+            st.session_state.batch_jobs = []
+            st.session_state.queue_mode = False
+            st.rerun()
+    else:
+        # Only called while jobs are unfinished, so the auto-refresh stops with them
+        show_live_batch_queue()
+
+@st.fragment(run_every=STATUS_REFRESH_SECONDS)
+def show_live_batch_queue():
+    jobs = get_analysis_queue().jobs(st.session_state.batch_jobs)
+    if all(job["status"] in BATCH_FINISHED_STATUSES for job in jobs):
+        st.rerun()
+    render_batch_jobs(jobs)
+
+def render_batch_jobs(jobs):
+    """Per-job status rows, with an Open button once a job's result is in"""
+    st.markdown('<div class="glass-container">', unsafe_allow_html=True)
+    st.markdown("### 📋 Batch Analysis Queue")
+    
+    finished = sum(job["status"] in BATCH_FINISHED_STATUSES for job in jobs)
+    failed = sum(job["status"] == "error" for job in jobs)
+    st.progress(finished / len(jobs), text=f"{finished}/{len(jobs)} finished • {failed} failed • up to {BATCH_CONCURRENCY} in flight")
+    
+    now = time.time()
+    for job in jobs:
+        video = job["video"]
+        cols = st.columns([4, 2, 2, 1])
+        with cols[0]:
+            st.markdown(f"**{video['title']}**  \n{video['channel']} • `{video['video_id']}`")
+        with cols[1]:
+            st.markdown(BATCH_STATUS_LABELS[job["status"]])
+            if job["message"]:
+                st.caption(job["message"])
+        with cols[2]:
+            started = job["started_at"] or job["queued_at"]
+            elapsed = (job["finished_at"] or now) - started
+            st.caption(f"{int(elapsed // 60)}m {int(elapsed % 60)}s • attempt {max(job['attempts'], 1)}")
+        with cols[3]:
+            if st.button("Open", key=f"open_job_{job['job_id']}", disabled=job["status"] != "complete"):
+                open_batch_result(job)
+    
+    st.markdown('</div>', unsafe_allow_html=True)
+
+def open_batch_result(job):
+    """Show a finished batch job in the single-video dashboard"""
+    reset_analysis_state()
+    st.session_state.selected_video = job["video"]
+    store_analysis_result(job["result"])
+    st.session_state.analysis_status = "complete"
+    # queue_mode stays set, so Back returns to the queue
+    st.session_state.dashboard_mode = True
+    st.rerun()
 
 # ─── Enhanced Dashboard Interface (FIXED) ────────────────────────────────────────────
 def dashboard_interface():
     video = st.session_state.selected_video
+    # Reloading the page reopens this video, see restore_from_query_params
+    if st.query_params.get("video") != video['video_id']:
+        st.query_params["video"] = video['video_id']
+    sync_with_job_registry(video['video_id'])
     
     # Back button
     if st.button("← Back to Search", key="back_button"):
         st.session_state.dashboard_mode = False
         st.session_state.selected_video = None
+        st.session_state.registry_synced_video = None
+        st.session_state.reuse_check = None
+        st.query_params.pop("video", None)
         st.session_state.raw_summary = None
+        st.session_state.analysis_result = None
         st.session_state.ai_insights = None
         st.session_state.analysis_status = "idle"
         st.rerun()
@@ -1179,7 +2338,12 @@ def dashboard_interface():
         # Analysis button
         if st.session_state.analysis_status == "idle":
             if st.button("🚀 Start Sentiment Analysis", use_container_width=True, key="start_analysis"):
-                trigger_sentiment_analysis(video['video_id'])
+                trigger_sentiment_analysis(video)
+        elif st.session_state.analysis_status == "complete" and st.session_state.shared_result_at:
+            age = int((time.time() - st.session_state.shared_result_at) // 60)
+            st.caption(f"♻️ Shared result from a run finished {age} min ago")
+            if st.button("🔁 Run Fresh Analysis", use_container_width=True, key="rerun_analysis"):
+                trigger_sentiment_analysis(video, force=True)
     
     st.markdown('</div>', unsafe_allow_html=True)
     
@@ -1187,223 +2351,435 @@ def dashboard_interface():
     show_enhanced_analysis_status()
     show_analysis_results()
 
-@st.fragment
 def show_enhanced_analysis_status():
-    """Enhanced analysis status with FIXED progressive checking - now as fragment"""
-    
-    if st.session_state.analysis_status == "processing":
-        st.markdown('<div class="glass-container">', unsafe_allow_html=True)
-        
-        # Initialize required session state variables
-        if not hasattr(st.session_state, 'analysis_start_time') or st.session_state.analysis_start_time is None:
-            st.session_state.analysis_start_time = time.time()
-        
-        if not hasattr(st.session_state, 'last_check_time'):
-            st.session_state.last_check_time = 0
-        
-        if not hasattr(st.session_state, 'auto_check_count'):
-            st.session_state.auto_check_count = 0
-        
-        elapsed_time = time.time() - st.session_state.analysis_start_time
-        
-        # Progressive checking intervals: 45s, 90s, 150s, 210s, etc.
-        check_intervals = [45, 90, 150, 210, 270, 330, 420, 510, 600]  # Added more intervals
-        
-        auto_check_triggered = False
-        
-        # Check if we should trigger auto-check
-        for i, interval in enumerate(check_intervals):
-            if elapsed_time >= interval and st.session_state.auto_check_count <= i:
-                st.markdown('<div style="text-align: center; margin: 20px 0; color: #667eea; font-weight: 600;">⏰ Auto-checking results...</div>', unsafe_allow_html=True)
-                st.session_state.auto_check_count = i + 1
-                st.session_state.last_check_time = interval
-                
-                # Trigger check and break to avoid infinite loop
-                check_result = check_for_results()
-                auto_check_triggered = True
-                
-                # If results found, don't continue processing
-                if st.session_state.analysis_status == "complete":
-                    break
-                
-                # Add a small delay to prevent rapid re-checking
-                time.sleep(2)
-                break
-        
-        # Display current status
-        if st.session_state.analysis_status == "processing":  # Only show if still processing
-            # Find next check interval for display
-            next_check = None
-            for interval in check_intervals:
-                if elapsed_time < interval:
-                    next_check = interval
-                    break
-            
-            if next_check:
-                remaining = max(0, int(next_check - elapsed_time))
-                minutes = remaining // 60
-                seconds = remaining % 60
-                
-                # Determine current phase based on elapsed time
-                if elapsed_time < 60:
-                    phase = "Fetching comments"
-                    estimated = "1-2 minutes remaining"
-                elif elapsed_time < 120:
-                    phase = "Analyzing sentiment"
-                    estimated = "2-3 minutes remaining"
-                elif elapsed_time < 240:
-                    phase = "Generating insights"
-                    estimated = "1-2 minutes remaining"
-                else:
-                    phase = "Finalizing results"
-                    estimated = "Almost done..."
-                
-                if minutes > 0:
-                    next_check_text = f"Next auto-check in {minutes}m {seconds}s"
-                else:
-                    next_check_text = f"Next auto-check in {seconds}s"
-                
-                show_loading_animation(phase, f"{estimated} • {next_check_text}")
-            else:
-                show_loading_animation("Still Processing", f"Running for {int(elapsed_time//60)}m {int(elapsed_time%60)}s...")
-            
-            # Progress simulation
-            st.markdown("""
-            <div class="progress-container">
-                <div style="font-weight: 600; margin-bottom: 10px;">Processing stages:</div>
-                <div style="margin-bottom: 5px;">✅ Fetching comments</div>
-                <div style="margin-bottom: 5px;">🔄 Analyzing sentiment...</div>
-                <div style="margin-bottom: 5px;">⏳ Generating insights...</div>
-                <div class="progress-bar">
-                    <div class="progress-bar-fill"></div>
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            col1, col2 = st.columns(2)
-            with col1:
-                if st.button("🔍 Check Results Now", key="check_results", use_container_width=True):
-                    check_for_results()
-            
-            with col2:
-                if st.button("🔄 Reset Analysis", key="reset_analysis", use_container_width=True):
-                    reset_analysis_state()
-                    st.rerun()  # Only this button still needs full rerun for complete reset
-        
-        st.markdown('</div>', unsafe_allow_html=True)
-        
-        # Auto-refresh fragment - only if still processing and not just auto-checked
-        if not auto_check_triggered and st.session_state.analysis_status == "processing":
-            # Wait 10 seconds then rerun this fragment only
-            time.sleep(10)
-            st.rerun()
+    """Analysis status: live fragment while processing, static banner and notices otherwise"""
+    if st.session_state.analysis_status in ("submitting", "processing"):
+        # Only called while running, so the fragment's auto-refresh stops with it
+        show_live_analysis_status()
     
     elif st.session_state.analysis_status == "complete":
         st.markdown('<div class="status-success">✅ Analysis Complete! Results are ready below.</div>', unsafe_allow_html=True)
+        render_notices("analysis")
+    
+    elif st.session_state.analysis_status == "idle" and st.session_state.reuse_check is not None:
+        show_reuse_check()
     
     elif st.session_state.analysis_status == "error":
+        if st.session_state.analysis_error:
+            st.markdown(f'<div class="status-error">❌ {st.session_state.analysis_error}</div>', unsafe_allow_html=True)
         st.markdown('<div class="status-error">❌ Analysis failed. Please try again or check your configuration.</div>', unsafe_allow_html=True)
 
+# A running job that reports no progress for this long is flagged as possibly stuck
+PROGRESS_STALL_SECONDS = 120
+
+# Progress snapshots kept per session for the scoring-rate estimate
+PROGRESS_RATE_SAMPLES = 10
+
+PROGRESS_STAGE_LABELS = {
+    "fetching": "Fetching comments",
+    "scoring": "Scoring sentiment",
+    "writing": "Writing results",
+}
+
+def track_progress(progress):
+    """Recent Progress snapshots of the session's running job, oldest first, with `progress` added"""
+    samples = st.session_state.progress_samples
+    if progress is not None:
+        if samples and samples[-1].started_at != progress.started_at:
+            samples.clear()
+        if not samples or progress.updated_at > samples[-1].updated_at:
+            samples.append(progress)
+            del samples[:-PROGRESS_RATE_SAMPLES]
+    return samples
+
+def expected_comments(progress, comment_count, comment_limit):
+    """Comments the job will score: as reported, else the video's count capped by the backend's limit
+
+    None when unknown, including incremental jobs that have not reported it:
+    they score only new comments, which the video's count says nothing about.
+    """
+    if progress.comments_expected:
+        return progress.comments_expected
+    if progress.incremental:
+        return None
+    known = [count for count in (comment_count, comment_limit) if count]
+    return min(known) if known else None
+
+def progress_panel_html(stage, fraction=None, detail=""):
+    """Processing stages up to `stage`, and a bar filled to `fraction` (moving while it is unknown)"""
+    current = sentiment_engine.PROGRESS_STAGES.index(stage)
+    rows = ""
+    for i, name in enumerate(sentiment_engine.PROGRESS_STAGES):
+        icon = "✅" if i < current else "🔄" if i == current else "⏳"
+        rows += f'<div style="margin-bottom: 5px;">{icon} {PROGRESS_STAGE_LABELS[name]}{"" if i < current else "..."}</div>'
+    if fraction is None:
+        fill = '<div class="progress-bar-fill"></div>'
+    else:
+        fill = f'<div class="progress-bar-fill determinate" style="width: {fraction:.0%};"></div>'
+    return f"""
+    <div class="progress-container">
+        <div style="font-weight: 600; margin-bottom: 10px;">Processing stages:</div>
+        {rows}
+        <div class="progress-bar">
+            {fill}
+        </div>
+        <div style="margin-top: 8px; font-size: 0.9em; color: #4a5568;">{detail}</div>
+    </div>
+    """
+
+@st.fragment(run_every=STATUS_REFRESH_SECONDS)
+def show_live_analysis_status():
+    """Live status fragment, re-run on a timer instead of sleeping the script thread"""
+    st.markdown('<div class="glass-container">', unsafe_allow_html=True)
+    
+    if st.session_state.analysis_status == "submitting":
+        if not resolve_submission():
+            show_loading_animation("Triggering Analysis", get_analysis_backend().submit_stage)
+            st.markdown('</div>', unsafe_allow_html=True)
+            return
+        if st.session_state.analysis_status != "processing":
+            st.rerun()
+    
+    if st.session_state.analysis_notice:
+        css_class, message = st.session_state.analysis_notice
+        st.markdown(f'<div class="{css_class}">{message}</div>', unsafe_allow_html=True)
+    
+    # Initialize required session state variables
+    if not hasattr(st.session_state, 'analysis_start_time') or st.session_state.analysis_start_time is None:
+        st.session_state.analysis_start_time = time.time()
+    
+    if not hasattr(st.session_state, 'last_check_time'):
+        st.session_state.last_check_time = 0
+    
+    if not hasattr(st.session_state, 'auto_check_count'):
+        st.session_state.auto_check_count = 0
+    
+    elapsed_time = time.time() - st.session_state.analysis_start_time
+    backend = get_analysis_backend()
+    notifier = None if backend.cheap_poll else get_result_notifier()
+    event_driven = backend.cheap_poll or (notifier is not None and notifier.delivers_all)
+    
+    video_id = st.session_state.selected_video['video_id']
+    job = get_job_registry().get(video_id)
+    # Learned from earlier runs of this backend on videos with about as many comments
+    comment_count = job_comment_count(job) if job is not None else st.session_state.selected_video.get('comment_count')
+    estimate = estimate_latency(backend.name, comment_count)
+    if job is not None and job["started_at"] == st.session_state.analysis_start_time and job["status"] != "processing":
+        # Another session or a batch worker already finished this run
+        adopt_registry_job(job)
+    elif backend.cheap_poll:
+        check_for_results()
+    elif notifier is not None:
+        blob_name = notifier.latest(video_id, since=st.session_state.analysis_start_time)
+        if blob_name and blob_name != st.session_state.get('last_notified_blob'):
+            st.session_state.last_notified_blob = blob_name
+            check_for_results(blob_name)
+        elif result_check_due(elapsed_time, st.session_state.last_check_time, estimate, notifier):
+            st.session_state.last_check_time = elapsed_time
+            check_for_results()
+    elif elapsed_time >= next_check_at(st.session_state.last_check_time, estimate):
+        st.markdown('<div style="text-align: center; margin: 20px 0; color: #667eea; font-weight: 600;">⏰ Auto-checking results...</div>', unsafe_allow_html=True)
+        st.session_state.auto_check_count += 1
+        st.session_state.last_check_time = elapsed_time
+        check_for_results()
+    
+    # Re-render the whole page only when the status actually changed
+    if st.session_state.analysis_status != "processing":
+        st.rerun()
+    render_notices("analysis")
+    
+    progress = backend.progress(video_id, since=st.session_state.analysis_start_time)
+    samples = track_progress(progress)
+    
+    # Without a progress record: stage and ETA from how far the run is into a typical run of its size
+    typical_share = elapsed_time / max(estimate.typical, 1)
+    stage = "fetching" if typical_share < 0.4 else "scoring" if typical_share < 0.8 else "writing"
+    if elapsed_time < estimate.typical:
+        estimated = f"About {format_duration(int(estimate.typical - elapsed_time))} remaining"
+    elif elapsed_time < estimate.late:
+        estimated = "Should finish any moment"
+    else:
+        estimated = f"Taking longer than usual (running {format_duration(int(elapsed_time))})"
+    if estimate.samples:
+        estimated += f" • typical run {format_duration(int(estimate.typical))} over {estimate.samples} recent runs"
+    fraction, detail, warning = None, "Stages estimated from earlier runs; the pipeline isn't reporting progress", ""
+    
+    # With one: real counts, and an ETA from the recent scoring rate
+    if progress is not None:
+        stage = progress.stage
+        expected = expected_comments(progress, comment_count, backend.comment_limit)
+        rate = sentiment_engine.scoring_rate(samples)
+        if stage == "writing":
+            fraction = 1.0
+        elif expected:
+            fraction = min(progress.comments_scored / expected, 1.0)
+        
+        detail = f"{progress.comments_scored:,} of ~{expected:,} comments scored" if expected else f"{progress.comments_scored:,} comments scored"
+        detail += f" • {progress.comments_fetched:,} fetched"
+        if rate:
+            detail += f" • {rate:,.0f} comments/s"
+            if expected and progress.comments_scored < expected:
+                estimated = f"About {format_duration(int((expected - progress.comments_scored) / rate))} remaining at the current rate"
+        if progress.incremental and not expected:
+            # Earlier runs' durations say nothing about how many comments are new
+            estimated = "Scoring only comments added since the last run"
+        
+        silent = time.time() - progress.updated_at
+        if silent > PROGRESS_STALL_SECONDS:
+            warning = f"⚠️ No progress reported for {format_duration(int(silent))}; the job may be stuck while {PROGRESS_STAGE_LABELS[stage].lower()}."
+    phase = PROGRESS_STAGE_LABELS[stage]
+    
+    if event_driven:
+        show_loading_animation(phase, f"{estimated} • Results will appear as soon as they land")
+    else:
+        remaining = max(0, int(next_check_at(st.session_state.last_check_time, estimate) - elapsed_time))
+        show_loading_animation(phase, f"{estimated} • Next auto-check in {format_duration(remaining)}")
+    
+    st.markdown(progress_panel_html(stage, fraction, detail), unsafe_allow_html=True)
+    if warning:
+        st.markdown(f'<div class="status-error">{warning}</div>', unsafe_allow_html=True)
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        if st.button("🔍 Check Results Now", key="check_results", use_container_width=True):
+            if check_for_results():
+                st.rerun()
+    
+    with col2:
+        if st.button("🔄 Reset Analysis", key="reset_analysis", use_container_width=True):
+            if st.session_state.analysis_owned:
+                # Release the claim so the next start is not joined to the abandoned run
+                get_job_registry().fail(st.session_state.selected_video['video_id'],
+                                        st.session_state.analysis_start_time, "Reset from the dashboard")
+            reset_analysis_state()
+            st.rerun()  # Only this button still needs full rerun for complete reset
+    
+    st.markdown('</div>', unsafe_allow_html=True)
+    
+    # Running aggregate of the comments processed so far, refreshed with this fragment
+    partial = backend.partial(st.session_state.selected_video['video_id'], since=st.session_state.analysis_start_time)
+    if partial is not None and partial.total:
+        show_metrics_dashboard(
+            partial.total, partial.mean, partial.positive, partial.negative, partial.neutral,
+            title=f"⚡ Live Overview · first {partial.total:,} comments",
+        )
+        show_enhanced_visualizations(
+            partial.positive, partial.negative, partial.neutral, partial.mean,
+            distribution=partial.histogram, trend=partial.history,
+        )
+
+# A finished registry job waiting on the video's fingerprint, fetched on the
+# background executor, before its result is shown; see show_reuse_check
+ReuseCheck = namedtuple("ReuseCheck", ["video_id", "job", "future"])
+
+def sync_with_job_registry(video_id):
+    """Join the video's in-flight run or show its recent result, once per dashboard visit"""
+    if st.session_state.registry_synced_video == video_id:
+        return
+    st.session_state.registry_synced_video = video_id
+    if st.session_state.analysis_status != "idle":
+        return
+    job = get_job_registry().get(video_id)
+    if job is None:
+        return
+    if job["status"] == "complete":
+        # Only show a finished result while it still matches the video's comments
+        fingerprinter = get_comment_fingerprinter()
+        fingerprint = fingerprinter.cached(video_id) if fingerprinter is not None else None
+        if fingerprinter is not None and fingerprint is None:
+            # Fetching one costs two YouTube calls, so it is not done on the script thread
+            future = get_background_executor().submit(fingerprinter.fingerprint, video_id)
+            st.session_state.reuse_check = ReuseCheck(video_id, job, future)
+            return
+        if not result_is_reusable(job, fingerprint):
+            return
+    adopt_registry_job(job, shared=True)
+
+def resolve_reuse_check():
+    """Show the checked job's result if it still stands; False while the fingerprint is in flight"""
+    check = st.session_state.reuse_check
+    if check is not None and not check.future.done():
+        return False
+    st.session_state.reuse_check = None
+    video = st.session_state.selected_video
+    if check is None or video is None or video['video_id'] != check.video_id or st.session_state.analysis_status != "idle":
+        return True
+    try:
+        fingerprint = check.future.result()
+    except Exception:
+        fingerprint = None  # As when the API is unreachable: result age alone decides
+    if result_is_reusable(check.job, fingerprint):
+        adopt_registry_job(check.job, shared=True)
+    return True
+
+@st.fragment(run_every=STATUS_REFRESH_SECONDS)
+def show_reuse_check():
+    """Waits for the background fingerprint, then re-renders the page with or without the result"""
+    if resolve_reuse_check():
+        st.rerun()
+    st.markdown('<div class="status-processing">🔎 Checking for a recent analysis of this video...</div>', unsafe_allow_html=True)
+
+def adopt_registry_job(job, shared=False):
+    """Mirror a registry job into this session; `shared` marks a result from someone else's run"""
+    now = time.time()
+    if job["status"] == "processing" and job["started_at"] > now - JOB_STALE_SECONDS:
+        st.session_state.analysis_status = "processing"
+        st.session_state.analysis_start_time = job["started_at"]
+    elif job["status"] == "complete":
+        store_analysis_result(job["result"])
+        st.session_state.analysis_start_time = job["started_at"]
+        st.session_state.shared_result_at = job["updated_at"] if shared else None
+        st.session_state.analysis_status = "complete"
+    elif job["status"] == "error" and not shared:
+        st.session_state.analysis_status = "error"
+
 def reset_analysis_state():
     """Helper function to reset all analysis-related state"""
     st.session_state.analysis_status = "idle"
     st.session_state.raw_summary = None
+    st.session_state.analysis_result = None
+    st.session_state.result_error = None
     st.session_state.ai_insights = None
     st.session_state.analysis_start_time = None
+    st.session_state.analysis_owned = False
     st.session_state.last_check_time = 0
     st.session_state.auto_check_count = 0
+    st.session_state.last_notified_blob = None
+    st.session_state.shared_result_at = None
+    st.session_state.submission = None
+    st.session_state.reuse_check = None
+    st.session_state.chart_figures = None
+    st.session_state.progress_samples = []
+    st.session_state.analysis_notice = None
+    st.session_state.analysis_error = None
     if 'refresh_placeholder' in st.session_state:
         del st.session_state.refresh_placeholder
 
-def trigger_sentiment_analysis(video_id):
-    """Enhanced analysis trigger with better error handling"""
-    func_url = st.secrets.get("COMMENTS_FUNC_URL", os.getenv("COMMENTS_FUNC_URL"))
-    bucket_name = st.secrets.get("RESULTS_BUCKET", os.getenv("RESULTS_BUCKET"))
-    
-    if not func_url or not bucket_name:
-        st.markdown('<div class="status-error">❌ COMMENTS_FUNC_URL or RESULTS_BUCKET missing in configuration.</div>', unsafe_allow_html=True)
-        return
+# ─── Analysis Submission ─────────────────────────────────────────────────────
+# Handle for an analysis being started on the background executor; the future
+# resolves to a SubmitOutcome or raises why the analysis could not start
+Submission = namedtuple("Submission", ["video_id", "requested_at", "future"])
+SubmitOutcome = namedtuple("SubmitOutcome", ["claimed", "job", "timed_out"])
+
+def submit_analysis(video, backend, registry, fingerprinter, force=False):
+    """Claim the video in the job registry and start its run; runs off the script thread
+
+    A run already in flight is joined and a recent result is taken instead of
+    submitting, unless `force` is set. Free of Streamlit calls.
+    """
+    video_id = video['video_id']
+    # Recorded with the run even when forced, so later claims can judge its result
+    fingerprint = fingerprinter.fingerprint(video_id) if fingerprinter is not None else None
+    claimed, job = registry.claim(video, backend.name, force=force, fingerprint=fingerprint)
+    if not claimed:
+        return SubmitOutcome(False, job, False)
+    try:
+        backend.submit(video_id, full=force)
+    except requests.exceptions.ReadTimeout:
+        # The function may still be running; the status fragment keeps checking
+        return SubmitOutcome(True, job, True)
+    except AnalysisSubmitError as e:
+        registry.fail(video_id, job["started_at"], str(e))
+        raise
+    except Exception as e:
+        registry.fail(video_id, job["started_at"], str(e))
+        raise AnalysisSubmitError(f"Function call failed: {e}") from e
+    return SubmitOutcome(True, job, False)
+
+def trigger_sentiment_analysis(video, force=False):
+    """Start an analysis and return its Submission without waiting on the network
+
+    The registry claim and the backend request run on the background executor;
+    the live status fragment picks up the outcome through resolve_submission.
+    """
+    backend = get_analysis_backend()
+    missing = backend.missing_config()
+    if missing:
+        st.markdown(f'<div class="status-error">❌ {missing}</div>', unsafe_allow_html=True)
+        return None
     
     # Reset state before starting new analysis
     reset_analysis_state()
     
-    placeholder = st.empty()
-    with placeholder.container():
-        show_loading_animation("Triggering Analysis", "Sending request to cloud function...")
+    future = get_background_executor().submit(
+        submit_analysis, video, backend, get_job_registry(), get_comment_fingerprinter(), force,
+    )
+    submission = Submission(video['video_id'], time.time(), future)
+    st.session_state.submission = submission
+    st.session_state.analysis_status = "submitting"
+    return submission
+
+def resolve_submission():
+    """Apply the session's finished Submission; False while it is still in flight"""
+    submission = st.session_state.submission
+    if submission is not None and not submission.future.done():
+        return False
+    st.session_state.submission = None
+    if submission is None:
+        st.session_state.analysis_status = "idle"
+        return True
     
     try:
-        response = requests.post(
-            func_url, 
-            json={"video_url": f"https://www.youtube.com/watch?v={video_id}"},
-            timeout=30
-        )
-        
-        if response.status_code == 200:
-            st.session_state.analysis_status = "processing"
-            st.session_state.analysis_start_time = time.time()
-            st.session_state.auto_check_count = 0
-            placeholder.markdown('<div class="status-success">✅ Analysis started successfully!</div>', unsafe_allow_html=True)
-            time.sleep(2)
-            placeholder.empty()
-            # Fragment will handle the status updates automatically
-            
-        else:
-            st.session_state.analysis_status = "error"
-            placeholder.markdown(f'<div class="status-error">❌ Function call failed with status: {response.status_code}<br>Response: {response.text}</div>', unsafe_allow_html=True)
-            
-    except requests.exceptions.Timeout:
-        st.session_state.analysis_status = "processing"
-        st.session_state.analysis_start_time = time.time()
-        st.session_state.auto_check_count = 0
-        placeholder.markdown('<div class="status-processing">⏳ Function call timed out, but analysis may still be running. Will check for results automatically.</div>', unsafe_allow_html=True)
-        time.sleep(2)
-        placeholder.empty()
-        
+        outcome = submission.future.result()
+    except AnalysisSubmitError as e:
+        st.session_state.analysis_status = "error"
+        st.session_state.analysis_error = str(e)
+        return True
     except Exception as e:
         st.session_state.analysis_status = "error"
-        placeholder.markdown(f'<div class="status-error">❌ Function call failed: {str(e)}</div>', unsafe_allow_html=True)
+        st.session_state.analysis_error = f"Could not start the analysis: {e}"
+        return True
+    
+    job = outcome.job
+    if not outcome.claimed:
+        adopt_registry_job(job, shared=True)
+        if st.session_state.analysis_status == "processing":
+            minutes = int((time.time() - job["started_at"]) // 60)
+            st.session_state.analysis_notice = ("status-processing", f"🔗 Joined the analysis already running for this video (started {minutes} min ago).")
+        elif st.session_state.analysis_status == "submitting":
+            st.session_state.analysis_status = "idle"
+        return True
+    
+    st.session_state.analysis_status = "processing"
+    st.session_state.analysis_start_time = job["started_at"]
+    st.session_state.analysis_owned = True
+    st.session_state.auto_check_count = 0
+    if outcome.timed_out:
+        st.session_state.analysis_notice = ("status-processing", "⏳ Function call timed out, but analysis may still be running. Will check for results automatically.")
+    return True
+
 
+def check_for_results(blob_name=None):
+    """FIXED results checking with better error handling and return value
 
-def check_for_results():
-    """FIXED results checking with better error handling and return value"""
+    When a notifier has already announced the result object, pass its name as
+    `blob_name` to fetch it directly instead of looking it up.
+    """
     video_id = st.session_state.selected_video['video_id']
-    bucket_name = st.secrets.get("RESULTS_BUCKET", os.getenv("RESULTS_BUCKET"))
+    backend = get_analysis_backend()
     
-    if not bucket_name:
+    if backend.name == "cloud" and not backend.bucket_name:
         st.markdown('<div class="status-error">❌ RESULTS_BUCKET missing in configuration.</div>', unsafe_allow_html=True)
         return False
     
     try:
-        client = storage.Client(credentials=st.session_state['google_creds'], project=st.session_state['google_project'])
-        bucket = client.bucket(bucket_name)
-        
-        # List all blobs with video_id prefix
-        blobs = list(bucket.list_blobs(prefix=video_id))
+        result = backend.fetch_result(
+            video_id, blob_name=blob_name, seen=st.session_state.get('last_processed_result'),
+            since=st.session_state.analysis_start_time or 0,
+        )
         
-        if blobs:
-            # Get the most recent blob
-            latest_blob = max(blobs, key=lambda b: b.time_created)
-            
-            # Check if this is a new result (not already processed)
-            blob_name = latest_blob.name
-            if hasattr(st.session_state, 'last_processed_blob') and st.session_state.last_processed_blob == blob_name:
-                return False  # Already processed this result
-            
-            # Download the content
-            content = latest_blob.download_as_text()
+        if result is not None:
+            content = result.content
             
             # Validate content is not empty or error
             if content and len(content.strip()) > 50:  # Basic validation
                 # Store in session state
-                st.session_state.raw_summary = content
+                store_analysis_result(result)
                 st.session_state.analysis_status = "complete"
-                st.session_state.last_processed_blob = blob_name
+                # Every other session joined to this run picks the result up from the registry
+                get_job_registry().complete(video_id, st.session_state.analysis_start_time, result)
                 
-                # Show success message briefly
-                success_placeholder = st.empty()
-                success_placeholder.markdown(f'<div class="status-success">✅ Results found! File: {latest_blob.name}</div>', unsafe_allow_html=True)
-                time.sleep(2)
-                success_placeholder.empty()
+                notify("analysis", f"✅ Results found! Source: {result.source}")
                 
                 return True
             else:
@@ -1412,82 +2788,88 @@ def check_for_results():
         else:
             # No results found yet
             return False
-            
+    
+    except (AnalysisFailedError, CredentialsError) as e:
+        st.session_state.analysis_status = "error"
+        st.session_state.analysis_error = str(e)
+        get_job_registry().fail(video_id, st.session_state.analysis_start_time, str(e))
+        return False
     except Exception as e:
-        error_placeholder = st.empty()
-        error_placeholder.markdown(f'<div class="status-error">❌ Error checking results: {str(e)}</div>', unsafe_allow_html=True)
-        time.sleep(3)
-        error_placeholder.empty()
+        notify("analysis", f"❌ Error checking results: {str(e)}", kind="error")
         return False
         
+# ─── Result Loading ──────────────────────────────────────────────────────────
+@st.cache_resource(show_spinner=False)
+def get_parsed_results():
+    """Parsed results by result key (object name and generation, or local run), shared by all sessions"""
+    return TieredCache("parsed_results", maxsize=512, ttl=24 * 3600)
+
+def load_sentiment_result(result):
+    """SentimentResult for an AnalysisResult, parsed once per result key in this process"""
+    cache = get_parsed_results()
+    parsed = cache.get(result.key)
+    if parsed is None:
+        parsed = sentiment_engine.parse_result(result.content)
+        cache.set(result.key, parsed)
+    return parsed
+
+def store_analysis_result(result):
+    """Put a fetched AnalysisResult into the session: parsed metrics plus the text summary"""
+    st.session_state.last_processed_result = result.key
+    try:
+        parsed = load_sentiment_result(result)
+    except sentiment_engine.ResultSchemaError as e:
+        st.session_state.analysis_result = None
+        st.session_state.raw_summary = result.content
+        st.session_state.result_error = str(e)
+        return
+    st.session_state.analysis_result = parsed
+    st.session_state.raw_summary = parsed.summary
+    st.session_state.result_error = None
+
 @st.fragment
 def show_analysis_results():
-    """Enhanced results display with better error handling"""
+    """Results display from the session's parsed SentimentResult; nothing is re-parsed on reruns"""
     if not st.session_state.raw_summary:
         return
     
     raw_summary = st.session_state.raw_summary
+    result = st.session_state.analysis_result
     
-    # Parse metrics with better error handling
-    try:
-        lines = [line.strip() for line in raw_summary.splitlines() if line.strip()]
-        data = {}
-        
-        for line in lines:
-            if ":" in line:
-                key, value = line.split(":", 1)
-                data[key.strip()] = value.strip()
-        
-        # Extract metrics with defaults
-        total_comments = 0
-        avg_sentiment = 0.0
-        positive_count = 0
-        negative_count = 0
-        neutral_count = 0
-        
-        try:
-            if "Total comments" in data:
-                total_comments = int(re.search(r'\d+', data["Total comments"]).group())
-            
-            if "Avg sentiment score" in data:
-                avg_sentiment = float(re.search(r'-?\d+\.?\d*', data["Avg sentiment score"]).group())
-            
-            if "Positive comments" in data:
-                sentiment_text = data["Positive comments"]
-                numbers = re.findall(r'\d+', sentiment_text)
-                if len(numbers) >= 3:
-                    positive_count = int(numbers[0])
-                    negative_count = int(numbers[1])
-                    neutral_count = int(numbers[2])
-        except (AttributeError, ValueError, IndexError) as e:
-            st.warning(f"⚠️ Could not parse some metrics: {e}")
-        
-        # Display metrics dashboard
-        show_metrics_dashboard(total_comments, avg_sentiment, positive_count, negative_count, neutral_count)
-        
-        # Visualizations (only if we have data)
-        if total_comments > 0:
-            show_enhanced_visualizations(positive_count, negative_count, neutral_count, avg_sentiment)
-        
-        # AI Insights
-        show_enhanced_ai_insights(raw_summary)
-        
-        # Raw data and downloads
-        show_enhanced_downloads(raw_summary)
-        
-    except Exception as e:
-        st.markdown(f'<div class="status-error">❌ Could not parse analysis results: {str(e)}</div>', unsafe_allow_html=True)
+    if result is None:
+        st.markdown(f'<div class="status-error">❌ Could not read analysis results: {st.session_state.result_error}</div>', unsafe_allow_html=True)
         
         # Show raw data as fallback
         st.markdown('<div class="glass-container">', unsafe_allow_html=True)
         st.markdown("### 📄 Raw Analysis Data")
         st.text_area("Raw Results", raw_summary, height=300, key="fallback_raw_data")
         st.markdown('</div>', unsafe_allow_html=True)
+        return
+    
+    for warning in result.warnings:
+        st.warning(f"⚠️ {warning}")
+    
+    # Display metrics dashboard
+    show_metrics_dashboard(result.total_comments, result.avg_sentiment, result.positive, result.negative, result.neutral)
+    
+    # Visualizations (only if we have data)
+    if result.total_comments > 0:
+        show_enhanced_visualizations(
+            result.positive, result.negative, result.neutral, result.avg_sentiment,
+            distribution=result.histogram, cache_key=st.session_state.last_processed_result,
+        )
+    
+    # AI Insights
+    show_enhanced_ai_insights(raw_summary)
+    
+    # Raw data and downloads
+    show_enhanced_downloads(raw_summary)
 
-def show_metrics_dashboard(total_comments, avg_sentiment, positive_count, negative_count, neutral_count):
+def show_metrics_dashboard(total_comments, avg_sentiment, positive_count, negative_count, neutral_count,
+                           title="📊 Sentiment Analysis Overview"):
     """Enhanced metrics display"""
     st.markdown('<div class="glass-container">', unsafe_allow_html=True)
-    st.markdown("### 📊 Sentiment Analysis Overview")
+    st.markdown(f"### {title}")
     
     # Create metric cards
     col1, col2, col3, col4, col5 = st.columns(5)
@@ -1535,61 +2917,57 @@ def show_metrics_dashboard(total_comments, avg_sentiment, positive_count, negati
     
     st.markdown('</div>', unsafe_allow_html=True)
 
-def show_enhanced_visualizations(positive_count, negative_count, neutral_count, avg_sentiment):
-    """Enhanced visualizations with multiple chart types"""
-    st.markdown('<div class="glass-container">', unsafe_allow_html=True)
-    st.markdown("### 📈 Sentiment Visualizations")
+SENTIMENT_LABELS = ['Positive', 'Negative', 'Neutral']
+SENTIMENT_COLORS = ['#48bb78', '#f56565', '#ed8936']
+
+def build_sentiment_figures(positive_count, negative_count, neutral_count, avg_sentiment,
+                            distribution=None, trend=None):
+    """Plotly figures for show_enhanced_visualizations, by chart name; charts without data are left out"""
+    import plotly.graph_objects as go
+
+    labels, colors = SENTIMENT_LABELS, SENTIMENT_COLORS
+    values = [positive_count, negative_count, neutral_count]
+    figures = {}
     
-    # Create two columns for charts
-    col1, col2 = st.columns(2)
+    # Pie chart for sentiment distribution
+    fig_pie = go.Figure(data=[go.Pie(
+        labels=labels, 
+        values=values,
+        hole=0.4,
+        marker_colors=colors,
+        textinfo='label+percent',
+        textfont_size=12
+    )])
     
-    with col1:
-        # Pie chart for sentiment distribution
-        labels = ['Positive', 'Negative', 'Neutral']
-        values = [positive_count, negative_count, neutral_count]
-        colors = ['#48bb78', '#f56565', '#ed8936']
-        
-        fig_pie = go.Figure(data=[go.Pie(
-            labels=labels, 
-            values=values,
-            hole=0.4,
-            marker_colors=colors,
-            textinfo='label+percent',
-            textfont_size=12
-        )])
-        
-        fig_pie.update_layout(
-            title="Sentiment Distribution",
-            font=dict(size=14),
-            showlegend=True,
-            height=400,
-            margin=dict(t=50, b=50, l=50, r=50)
-        )
-        
-        st.plotly_chart(fig_pie, use_container_width=True)
+    fig_pie.update_layout(
+        title="Sentiment Distribution",
+        font=dict(size=14),
+        showlegend=True,
+        height=400,
+        margin=dict(t=50, b=50, l=50, r=50)
+    )
+    figures["pie"] = fig_pie
     
-    with col2:
-        # Bar chart for sentiment counts
-        fig_bar = go.Figure(data=[
-            go.Bar(
-                x=labels,
-                y=values,
-                marker_color=colors,
-                text=values,
-                textposition='auto',
-            )
-        ])
-        
-        fig_bar.update_layout(
-            title="Sentiment Counts",
-            xaxis_title="Sentiment Type",
-            yaxis_title="Number of Comments",
-            font=dict(size=14),
-            height=400,
-            margin=dict(t=50, b=50, l=50, r=50)
+    # Bar chart for sentiment counts
+    fig_bar = go.Figure(data=[
+        go.Bar(
+            x=labels,
+            y=values,
+            marker_color=colors,
+            text=values,
+            textposition='auto',
         )
-        
-        st.plotly_chart(fig_bar, use_container_width=True)
+    ])
+    
+    fig_bar.update_layout(
+        title="Sentiment Counts",
+        xaxis_title="Sentiment Type",
+        yaxis_title="Number of Comments",
+        font=dict(size=14),
+        height=400,
+        margin=dict(t=50, b=50, l=50, r=50)
+    )
+    figures["bar"] = fig_bar
     
     # Sentiment score visualization
     if avg_sentiment != 0:
@@ -1617,14 +2995,138 @@ def show_enhanced_visualizations(positive_count, negative_count, neutral_count,
         ))
         
         fig_gauge.update_layout(height=300, margin=dict(t=50, b=50, l=50, r=50))
-        st.plotly_chart(fig_gauge, use_container_width=True)
+        figures["gauge"] = fig_gauge
+    
+    if distribution is not None:
+        width = 2.0 / len(distribution)
+        centers = [-1.0 + width * (i + 0.5) for i in range(len(distribution))]
+        fig_hist = go.Figure(data=[go.Bar(
+            x=centers,
+            y=list(distribution),
+            width=width,
+            marker_color=['#f56565' if c < 0 else '#48bb78' for c in centers],
+        )])
+        fig_hist.update_layout(
+            title="Score Distribution",
+            xaxis_title="Sentiment Score",
+            yaxis_title="Number of Comments",
+            font=dict(size=14),
+            height=350,
+            margin=dict(t=50, b=50, l=50, r=50)
+        )
+        figures["histogram"] = fig_hist
+    
+    if trend:
+        # Share of each class per batch, plotted against comments processed
+        x = [point[0] for point in trend]
+        fig_trend = go.Figure()
+        for offset, (label, color) in enumerate(zip(labels, colors), start=1):
+            fig_trend.add_trace(go.Scatter(
+                x=x,
+                y=[point[offset] / max(sum(point[1:]), 1) for point in trend],
+                name=label,
+                mode='lines',
+                line=dict(color=color),
+            ))
+        fig_trend.update_layout(
+            title="Sentiment as Comments Arrive",
+            xaxis_title="Comments Processed",
+            yaxis_title="Share of Batch",
+            yaxis_tickformat='.0%',
+            font=dict(size=14),
+            height=350,
+            margin=dict(t=50, b=50, l=50, r=50)
+        )
+        figures["trend"] = fig_trend
+    
+    return figures
+
+def show_enhanced_visualizations(positive_count, negative_count, neutral_count, avg_sentiment,
+                                 distribution=None, trend=None, cache_key=None):
+    """Enhanced visualizations with multiple chart types
+
+    `distribution` (score histogram over [-1, 1]) and `trend` (per-batch
+    (comments so far, positive, negative, neutral)) come from a streamed
+    aggregate and add charts of their own. With a `cache_key` (the result
+    key of a finished analysis) the figures are built once per session and
+    kept in session state, so no figure object is shared between sessions.
+    """
+    cached = st.session_state.chart_figures
+    if cache_key is not None and cached is not None and cached[0] == cache_key:
+        figures = cached[1]
+    else:
+        figures = build_sentiment_figures(positive_count, negative_count, neutral_count, avg_sentiment,
+                                          distribution=distribution, trend=trend)
+        if cache_key is not None:
+            st.session_state.chart_figures = (cache_key, figures)
+
+    st.markdown('<div class="glass-container">', unsafe_allow_html=True)
+    st.markdown("### 📈 Sentiment Visualizations")
+    
+    # Create two columns for charts
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.plotly_chart(figures["pie"], use_container_width=True)
+    
+    with col2:
+        st.plotly_chart(figures["bar"], use_container_width=True)
+    
+    if "gauge" in figures:
+        st.plotly_chart(figures["gauge"], use_container_width=True)
+    
+    if "histogram" in figures or "trend" in figures:
+        col1, col2 = st.columns(2)
+    
+    if "histogram" in figures:
+        with col1:
+            st.plotly_chart(figures["histogram"], use_container_width=True)
+    
+    if "trend" in figures:
+        with col2:
+            st.plotly_chart(figures["trend"], use_container_width=True)
     
     st.markdown('</div>', unsafe_allow_html=True)
 
+# ─── AI Insights ─────────────────────────────────────────────────────────────
+GEMINI_MODEL = "gemini-1.5-pro"
+
+# Part of the insight cache key: bump it whenever INSIGHTS_PROMPT changes so
+# insights written for the old prompt are no longer served
+INSIGHTS_PROMPT_VERSION = 1
+
+INSIGHTS_PROMPT = """
+        Analyze this YouTube video sentiment analysis data and provide insightful observations:
+        
+        {summary}
+        
+        Please provide:
+        1. **Key Findings**: What are the main sentiment patterns?
+        2. **Audience Engagement**: What does this tell us about viewer engagement?
+        3. **Content Performance**: How is the content being received?
+        4. **Recommendations**: What actionable insights can you provide?
+        5. **Notable Patterns**: Any interesting trends or outliers?
+        
+        Format your response in markdown with clear sections and bullet points.
+        Keep it concise but insightful (max 500 words).
+        """
+
+@st.cache_resource
+def get_insights_cache():
+    """Gemini insights by (summary hash, model, prompt version), shared by every session"""
+    ttl = int(st.secrets.get("INSIGHTS_CACHE_TTL", os.getenv("INSIGHTS_CACHE_TTL", str(7 * 24 * 3600))))
+    return TieredCache("insights", maxsize=256, ttl=ttl, store=get_cache_store())
+
+def insights_cache_key(raw_summary, model_name=GEMINI_MODEL):
+    """Identical summaries asked of the same model with the same prompt share an entry"""
+    return [hashlib.sha256(raw_summary.encode("utf-8")).hexdigest(), model_name, INSIGHTS_PROMPT_VERSION]
+
+@st.fragment
 def show_enhanced_ai_insights(raw_summary):
-    """Enhanced AI insights generation"""
+    """Enhanced AI insights generation; a fragment so its buttons don't re-send the charts"""
     st.markdown('<div class="glass-container">', unsafe_allow_html=True)
     st.markdown("### 🤖 AI-Generated Insights")
+    render_notices("insights")
     
     if not st.session_state.ai_insights:
         if st.button("🧠 Generate AI Insights", use_container_width=True):
@@ -1636,48 +3138,53 @@ def show_enhanced_ai_insights(raw_summary):
         
         if st.button("🔄 Regenerate Insights", use_container_width=True):
             st.session_state.ai_insights = None
-            generate_ai_insights(raw_summary)
+            # Asks Gemini again; the fresh answer replaces the cached one
+            generate_ai_insights(raw_summary, refresh=True)
+    
+    stats = get_insights_cache().stats()
+    st.caption(
+        f"Insight cache: {stats['memory_hits'] + stats['disk_hits']} hits "
+        f"({stats['disk_hits']} from disk) • {stats['misses']} misses • {stats['hit_rate']:.0%} hit rate"
+    )
     
     st.markdown('</div>', unsafe_allow_html=True)
 
-def generate_ai_insights(raw_summary):
-    """Generate AI insights using Gemini"""
+def generate_ai_insights(raw_summary, refresh=False):
+    """Generate AI insights using Gemini, or reuse the cached ones for this summary unless `refresh`"""
+    cache = get_insights_cache()
+    key = insights_cache_key(raw_summary)
+    if not refresh:
+        cached = cache.get(key)
+        if cached is not None:
+            st.session_state.ai_insights = cached
+            notify("insights", "⚡ Insights loaded from cache")
+            st.rerun()
+    
     placeholder = st.empty()
     with placeholder.container():
         show_loading_animation("Generating AI Insights", "Analyzing patterns and trends...")
     
     try:
-        model = genai.GenerativeModel('gemini-1.5-pro')
-        
-        prompt = f"""
-        Analyze this YouTube video sentiment analysis data and provide insightful observations:
-        
-        {raw_summary}
-        
-        Please provide:
-        1. **Key Findings**: What are the main sentiment patterns?
-        2. **Audience Engagement**: What does this tell us about viewer engagement?
-        3. **Content Performance**: How is the content being received?
-        4. **Recommendations**: What actionable insights can you provide?
-        5. **Notable Patterns**: Any interesting trends or outliers?
+        model = get_gemini().GenerativeModel(GEMINI_MODEL)
         
-        Format your response in markdown with clear sections and bullet points.
-        Keep it concise but insightful (max 500 words).
-        """
+        prompt = INSIGHTS_PROMPT.format(summary=raw_summary)
         
         response = model.generate_content(prompt)
         st.session_state.ai_insights = response.text
+        cache.set(key, response.text)
         
-        placeholder.markdown('<div class="status-success">✅ AI insights generated successfully!</div>', unsafe_allow_html=True)
-        time.sleep(1)
         placeholder.empty()
+        notify("insights", "✅ AI insights generated successfully!")
+        # Full rerun so the JSON download picks up the insights; the charts come from the cache
         st.rerun()
         
     except Exception as e:
         placeholder.markdown(f'<div class="status-error">❌ Failed to generate insights: {str(e)}</div>', unsafe_allow_html=True)
 
+# ─── Downloads ───────────────────────────────────────────────────────────────
+@st.fragment
 def show_enhanced_downloads(raw_summary):
-    """Enhanced download section with multiple formats"""
+    """Enhanced download section with multiple formats, a fragment like the insights section"""
     st.markdown('<div class="glass-container">', unsafe_allow_html=True)
     st.markdown("### 📥 Download Results")
     
@@ -1697,10 +3204,12 @@ def show_enhanced_downloads(raw_summary):
         # JSON file download
         try:
             # Convert raw summary to structured JSON
+            result = st.session_state.analysis_result
             json_data = {
                 "video_id": st.session_state.selected_video['video_id'],
                 "video_title": st.session_state.selected_video['title'],
                 "analysis_timestamp": datetime.now().isoformat(),
+                "result": result._asdict() if result is not None else None,
                 "raw_analysis": raw_summary,
                 "ai_insights": st.session_state.ai_insights or "Not generated"
             }
@@ -1720,10 +3229,17 @@ def show_enhanced_downloads(raw_summary):
         if st.button("📑 Generate PDF Report", use_container_width=True):
             generate_pdf_report(raw_summary)
     
+    result = st.session_state.analysis_result
+    if result is not None and result.comments_table:
+        bucket_name = st.secrets.get("RESULTS_BUCKET", os.getenv("RESULTS_BUCKET"))
+        st.caption(f"📦 Per-comment scores (Parquet): `gs://{bucket_name}/{result.comments_table}`")
+    
     st.markdown('</div>', unsafe_allow_html=True)
 
 def generate_pdf_report(raw_summary):
     """Generate and download PDF report"""
+    from fpdf import FPDF
+
     placeholder = st.empty()
     with placeholder.container():
         show_loading_animation("Generating PDF Report", "Creating formatted document...")
@@ -1831,15 +3347,30 @@ def show_footer():
 # ─── Main App Logic ───────────────────────────────────────────────────────────
 def main():
     """Main application logic"""
+    restore_from_query_params()
     show_header()
     
-    if not st.session_state.dashboard_mode:
-        search_interface()
-    else:
+    if st.session_state.dashboard_mode:
         dashboard_interface()
+    elif st.session_state.queue_mode:
+        queue_interface()
+    else:
+        search_interface()
     
     show_footer()
 
+def restore_from_query_params():
+    """After a page reload, reopen the video named in the URL if the job registry knows it"""
+    video_id = st.query_params.get("video")
+    if not video_id or st.session_state.selected_video is not None:
+        return
+    job = get_job_registry().get(video_id)
+    if job is None:
+        del st.query_params["video"]
+        return
+    st.session_state.selected_video = job["video"]
+    st.session_state.dashboard_mode = True
+
 # ─── Run the app ──────────────────────────────────────────────────────────────
 if __name__ == "__main__":
     main()
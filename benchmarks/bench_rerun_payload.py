@@ -0,0 +1,100 @@
+"""Bytes the app sends to the browser per script run.
+
+Sums the serialized size of every ForwardMsg a run enqueues, for the first
+run of a session and for the reruns after it, on the search page and on the
+dashboard while an analysis is processing. The figures are what a client
+without Streamlit's forward-message cache receives.
+
+    git show <rev>:app.py > /tmp/app_before.py
+    python benchmarks/bench_rerun_payload.py --app /tmp/app_before.py --app app.py
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from bench_startup import ROOT, dummy_secrets
+
+SCENARIOS = {
+    "search page": {},
+    "dashboard, processing": {
+        "dashboard_mode": True,
+        "analysis_status": "processing",
+        "selected_video": {
+            "video_id": "dQw4w9WgXcQ",
+            "title": "Benchmark video",
+            "channel": "Benchmark channel",
+            "published": "2024-01-01",
+            "thumbnail": "https://i.ytimg.com/vi/dQw4w9WgXcQ/mqdefault.jpg",
+            "description": "",
+        },
+    },
+}
+
+def measure_app(app_path, secrets, scenario, reruns):
+    """Runs in the child interpreter"""
+    from streamlit.runtime.scriptrunner_utils.script_run_context import ScriptRunContext
+    from streamlit.testing.v1 import AppTest
+
+    sizes = []
+    original = ScriptRunContext.enqueue
+
+    def counting_enqueue(self, msg):
+        sizes[-1] += msg.ByteSize()
+        return original(self, msg)
+
+    ScriptRunContext.enqueue = counting_enqueue
+
+    at = AppTest.from_file(os.path.abspath(app_path), default_timeout=30)
+    for key, value in secrets.items():
+        at.secrets[key] = value
+    for key, value in SCENARIOS[scenario].items():
+        at.session_state[key] = value
+    if "analysis_status" in SCENARIOS[scenario]:
+        at.session_state["analysis_start_time"] = time.time()
+
+    for _ in range(reruns + 1):
+        sizes.append(0)
+        at.run()
+    return {"first_bytes": sizes[0], "rerun_bytes": statistics.median(sizes[1:])}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--app", action="append", help="app script to measure (repeatable)")
+    parser.add_argument("--reruns", type=int, default=5)
+    parser.add_argument("--timeout", type=int, default=60, help="seconds allowed per scenario")
+    parser.add_argument("--child", nargs="+", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        app, secrets, scenario, reruns = args.child
+        print(json.dumps(measure_app(app, json.loads(secrets), scenario, int(reruns))))
+        return
+
+    secrets = json.dumps(dummy_secrets())
+    for app in args.app or [os.path.join(ROOT, "app.py")]:
+        print(app)
+        for scenario in SCENARIOS:
+            try:
+                out = subprocess.run(
+                    [sys.executable, os.path.abspath(__file__), "--child", app, secrets, scenario, str(args.reruns)],
+                    capture_output=True, text=True, cwd=ROOT, timeout=args.timeout,
+                )
+                lines = [line for line in out.stdout.splitlines() if line.startswith("{")]
+            except subprocess.TimeoutExpired:
+                lines = []
+            if not lines:
+                # e.g. a status loop that sleeps and reruns forever never lets the run finish
+                print(f"  {scenario:<24} run did not finish within {args.timeout}s")
+                continue
+            result = json.loads(lines[-1])
+            print(
+                f"  {scenario:<24} first run {result['first_bytes'] / 1024:7.1f} KiB"
+                f"   per rerun {result['rerun_bytes'] / 1024:7.1f} KiB"
+            )
+
+if __name__ == "__main__":
+    main()
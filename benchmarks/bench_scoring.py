@@ -0,0 +1,87 @@
+"""Comments per second for the local sentiment scorer.
+
+Scores synthetic comments (lexicon words, negators, intensifiers and filler
+in English, Hindi and Hinglish) at several batch sizes:
+
+    python benchmarks/bench_scoring.py
+    python benchmarks/bench_scoring.py --sizes 1000 100000 1000000 --reference-limit 100000
+
+Up to --reference-limit comments are also scored by a straightforward
+per-comment loop implementing the same rules; its scores must match the
+vectorized scorer's and its rate is reported for comparison.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import sentiment_engine as se  # noqa: E402
+
+FILLER = (
+    "the video this is was and i it to of for bhai yaar hai tha ki ko ye wo "
+    "है था की को ये वो और part episode song music editing channel bro sir "
+    "😂 🔥 ❤️ !! ... bro!! 2:15 @creator #shorts"
+).split()
+
+def synthetic_comments(count, seed=0):
+    rng = random.Random(seed)
+    words = (
+        sorted(se.LEXICON) + sorted(se.NEGATIONS) + sorted(se.TRAILING_NEGATIONS)
+        + sorted(se.INTENSIFIERS) + FILLER * 6
+    )
+    return [" ".join(rng.choices(words, k=rng.randint(3, 30))) for _ in range(count)]
+
+def reference_score(comments):
+    """Per-comment loop over the same rules as se.score_comments"""
+    scores = np.zeros(len(comments))
+    for i, comment in enumerate(comments):
+        tokens = se.tokenize(comment)
+        total, hits = 0.0, 0
+        for j, token in enumerate(tokens):
+            score = se.LEXICON.get(token, 0.0)
+            if not score:
+                continue
+            if j >= 1:
+                score *= 1.0 + se.INTENSIFIERS.get(tokens[j - 1], 0.0)
+            negated = any(tokens[j - k] in se.NEGATIONS for k in range(1, se.NEGATION_SCOPE + 1) if j >= k)
+            negated |= j + 1 < len(tokens) and tokens[j + 1] in se.TRAILING_NEGATIONS
+            total += score * (se.NEGATION_FACTOR if negated else 1.0)
+            hits += 1
+        scores[i] = min(max(total / max(hits, 1), -1.0), 1.0)
+    return scores
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    parser.add_argument("--reference-limit", type=int, default=100_000,
+                        help="largest size also scored by the per-comment reference loop")
+    args = parser.parse_args()
+
+    print(f"{'comments':>10}  {'vectorized':>14}  {'reference':>14}  {'speedup':>7}  pos/neg/neu, avg")
+    for size in args.sizes:
+        comments = synthetic_comments(size)
+        scores, elapsed = timed(se.score_comments, comments)
+        positive, negative, neutral = se.classify(scores)
+        line = f"{size:>10,}  {size / elapsed:>10,.0f} c/s"
+
+        if size <= args.reference_limit:
+            expected, ref_elapsed = timed(reference_score, comments)
+            if not np.allclose(scores, expected):
+                raise SystemExit(f"score mismatch at {size} comments")
+            line += f"  {size / ref_elapsed:>10,.0f} c/s  {ref_elapsed / elapsed:>6.1f}x"
+        else:
+            line += f"  {'-':>14}  {'-':>7}"
+        print(f"{line}  {positive}/{negative}/{neutral}, {scores.mean():+.4f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""Cold-start and per-rerun timing for the Streamlit app.
+
+Each app is measured in a fresh interpreter so imports are genuinely cold:
+the first AppTest run is the cold start, later runs are ordinary reruns.
+
+    python benchmarks/bench_startup.py
+    git show <rev>:app.py > /tmp/app_before.py
+    python benchmarks/bench_startup.py --app /tmp/app_before.py --app app.py
+
+Dummy secrets are used unless --secrets points at a secrets.toml. The dummy
+service account carries a freshly generated RSA key, so versions of the app
+that parse credentials on every rerun pay the real parsing cost.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def dummy_secrets():
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    pem = key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    ).decode()
+    service_account = {
+        "type": "service_account",
+        "project_id": "dummy",
+        "private_key_id": "dummy",
+        "private_key": pem,
+        "client_email": "bench@dummy.iam.gserviceaccount.com",
+        "client_id": "0",
+        "token_uri": "https://oauth2.googleapis.com/token",
+    }
+    return {
+        "GEMINI_API_KEY": "dummy",
+        "YOUTUBE_API_KEY": "dummy",
+        "GOOGLE_APPLICATION_CREDENTIALS": json.dumps(service_account),
+        "RESULTS_BUCKET": "dummy",
+        "COMMENTS_FUNC_URL": "http://127.0.0.1:9/",
+    }
+
+HEAVY_MODULES = [
+    "streamlit",
+    "googleapiclient.discovery",
+    "google.cloud.storage",
+    "google.generativeai",
+    "matplotlib.pyplot",
+    "plotly.graph_objects",
+    "fpdf",
+]
+
+def measure_app(app_path, secrets, reruns):
+    """Runs in the child interpreter.
+
+    Times the script body itself: AppTest polls for completion, which would
+    otherwise dominate the per-rerun figures.
+    """
+    from streamlit.runtime.scriptrunner import exec_code, script_runner
+    from streamlit.testing.v1 import AppTest
+
+    timings = []
+    original = exec_code.exec_func_with_error_handling
+
+    def timed(func, ctx):
+        start = time.perf_counter()
+        try:
+            return original(func, ctx)
+        finally:
+            timings.append(time.perf_counter() - start)
+
+    script_runner.exec_func_with_error_handling = timed
+
+    at = AppTest.from_file(os.path.abspath(app_path), default_timeout=120)
+    for key, value in secrets.items():
+        at.secrets[key] = value
+
+    for _ in range(reruns + 1):
+        at.run()
+    cold, warm = timings[0], timings[1:]
+    return {"cold_s": cold, "rerun_median_s": statistics.median(warm), "rerun_min_s": min(warm)}
+
+def measure_import(module):
+    """Runs in the child interpreter"""
+    import importlib
+
+    start = time.perf_counter()
+    importlib.import_module(module)
+    return {"import_s": time.perf_counter() - start}
+
+def run_child(*args):
+    out = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", *args],
+        capture_output=True, text=True, cwd=ROOT,
+    )
+    for line in reversed(out.stdout.splitlines()):
+        if line.startswith("{"):
+            return json.loads(line)
+    raise RuntimeError(out.stderr[-2000:])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--app", action="append", help="app script to measure (repeatable)")
+    parser.add_argument("--secrets", help="secrets.toml to use instead of dummy secrets")
+    parser.add_argument("--reruns", type=int, default=10)
+    parser.add_argument("--child", nargs="+", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        kind, target, *rest = args.child
+        if kind == "import":
+            result = measure_import(target)
+        else:
+            result = measure_app(target, json.loads(rest[0]), int(rest[1]))
+        print(json.dumps(result))
+        return
+
+    secrets = dummy_secrets()
+    if args.secrets:
+        import tomllib
+
+        with open(args.secrets, "rb") as f:
+            secrets = {key: value if isinstance(value, str) else json.dumps(value) for key, value in tomllib.load(f).items()}
+
+    print("Cold import cost per module (fresh interpreter each):")
+    for module in HEAVY_MODULES:
+        try:
+            print(f"  {module:<28} {run_child('import', module)['import_s'] * 1000:8.1f} ms")
+        except RuntimeError:
+            print(f"  {module:<28} {'not installed':>11}")
+
+    print("\nApp timings:")
+    for app in args.app or [os.path.join(ROOT, "app.py")]:
+        result = run_child("app", app, json.dumps(secrets), str(args.reruns))
+        print(
+            f"  {app}\n"
+            f"    cold start   {result['cold_s'] * 1000:8.1f} ms\n"
+            f"    rerun median {result['rerun_median_s'] * 1000:8.1f} ms (min {result['rerun_min_s'] * 1000:.1f} ms)"
+        )
+
+if __name__ == "__main__":
+    main()
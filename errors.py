@@ -0,0 +1,23 @@
+"""Exceptions shared by the dashboard's analysis backends, queue and sessions.
+
+Streamlit re-executes app.py on every rerun, so classes defined there are new
+objects each run while the cached backends and queue keep raising the ones
+from the run that created them. Defining them here keeps one class per
+process, so ``except`` and ``isinstance`` checks match.
+"""
+
+
+class CredentialsError(Exception):
+    """GOOGLE_APPLICATION_CREDENTIALS could not be turned into service account credentials"""
+
+
+class AnalysisSubmitError(Exception):
+    """The backend rejected an analysis request"""
+
+
+class AnalysisFailedError(Exception):
+    """A submitted analysis finished without producing a result"""
+
+
+class AnalysisQuotaError(AnalysisSubmitError):
+    """The backend or YouTube API is out of quota; the request may be retried later"""
@@ -0,0 +1,599 @@
+"""Local sentiment engine for the dashboard's in-process analysis backend.
+
+Fetches a video's comments (YouTube Data API or a local fixture), scores them
+with a lexicon model over NumPy arrays and renders the same text summary the
+Dataflow pipeline writes, so the dashboard parses both identically.
+
+This module must not import Streamlit: it runs on worker threads and in the
+benchmarks, outside any script run.
+"""
+import json
+import os
+import re
+import time
+from collections import namedtuple
+from itertools import repeat
+
+import numpy as np
+
+# ─── Lexicons ─────────────────────────────────────────────────────────────────
+# Scores are in [-1, 1]. Hinglish entries are romanized Hindi as typed in comments.
+ENGLISH_LEXICON = {
+    "good": 0.6, "great": 0.8, "awesome": 0.9, "amazing": 0.9, "excellent": 0.9,
+    "love": 0.8, "loved": 0.8, "loving": 0.7, "like": 0.4, "liked": 0.4, "nice": 0.5,
+    "best": 0.8, "beautiful": 0.7, "brilliant": 0.8, "perfect": 0.9, "fantastic": 0.9,
+    "wonderful": 0.8, "helpful": 0.6, "useful": 0.5, "informative": 0.5, "fun": 0.6,
+    "funny": 0.5, "enjoyed": 0.6, "happy": 0.6, "thanks": 0.4, "thank": 0.4,
+    "cool": 0.5, "wow": 0.6, "superb": 0.9, "masterpiece": 0.9, "legend": 0.7,
+    "recommend": 0.5, "impressive": 0.7, "underrated": 0.3, "clear": 0.3, "respect": 0.5,
+    "bad": -0.6, "worst": -0.9, "terrible": -0.9, "awful": -0.8, "horrible": -0.9,
+    "hate": -0.8, "hated": -0.8, "boring": -0.6, "poor": -0.6, "waste": -0.7,
+    "useless": -0.7, "stupid": -0.7, "fake": -0.6, "disappointed": -0.7,
+    "disappointing": -0.7, "annoying": -0.6, "sad": -0.4, "wrong": -0.4, "dislike": -0.6,
+    "cringe": -0.6, "clickbait": -0.7, "scam": -0.9, "trash": -0.8, "garbage": -0.8,
+    "overrated": -0.4, "misleading": -0.6, "slow": -0.3, "confusing": -0.4, "pathetic": -0.8,
+}
+
+HINDI_LEXICON = {
+    "अच्छा": 0.6, "अच्छी": 0.6, "अच्छे": 0.6, "बढ़िया": 0.8, "शानदार": 0.9,
+    "जबरदस्त": 0.9, "प्यार": 0.7, "सुंदर": 0.7, "धन्यवाद": 0.4,
+    "मस्त": 0.7, "कमाल": 0.8, "खूबसूरत": 0.7, "सही": 0.4, "उपयोगी": 0.5,
+    "बुरा": -0.6, "बुरी": -0.6, "बेकार": -0.7, "घटिया": -0.8, "खराब": -0.6,
+    "बकवास": -0.8, "नफरत": -0.8, "गलत": -0.4, "दुखी": -0.5, "झूठ": -0.6,
+}
+
+HINGLISH_LEXICON = {
+    "accha": 0.6, "acha": 0.6, "achha": 0.6, "badhiya": 0.8, "badiya": 0.8,
+    "shandar": 0.9, "zabardast": 0.9, "jabardast": 0.9, "mast": 0.7, "kamaal": 0.8,
+    "kamal": 0.8, "pyaar": 0.7, "pyar": 0.7, "sahi": 0.4, "dhanyawad": 0.4,
+    "shukriya": 0.4, "khoobsurat": 0.7, "bura": -0.6, "buri": -0.6, "bekar": -0.7,
+    "bekaar": -0.7, "ghatiya": -0.8, "kharab": -0.6, "bakwas": -0.8, "bakwaas": -0.8,
+    "nafrat": -0.8, "galat": -0.4, "jhooth": -0.6, "faltu": -0.7,
+}
+
+LEXICON = {**ENGLISH_LEXICON, **HINDI_LEXICON, **HINGLISH_LEXICON}
+
+# Negators flip every lexicon hit within NEGATION_SCOPE tokens after them
+NEGATIONS = frozenset({
+    "not", "no", "never", "nothing", "dont", "don't", "doesnt", "doesn't", "didnt", "didn't",
+    "isnt", "isn't", "wasnt", "wasn't", "cant", "can't", "wont", "won't", "aint", "ain't",
+    "nahi", "nahin", "nai", "mat", "नहीं", "मत", "ना",
+})
+NEGATION_SCOPE = 3
+NEGATION_FACTOR = -0.74
+
+# Hindi/Hinglish negation usually follows the word it negates ("accha nahi")
+TRAILING_NEGATIONS = frozenset({"nahi", "nahin", "nai", "नहीं"})
+
+# Intensifiers scale the hit immediately after them by (1 + boost)
+INTENSIFIERS = {
+    "very": 0.3, "really": 0.3, "so": 0.2, "too": 0.2, "super": 0.4, "extremely": 0.5,
+    "absolutely": 0.4, "totally": 0.3, "most": 0.2, "slightly": -0.3, "bit": -0.3,
+    "bahut": 0.3, "bohot": 0.3, "bhot": 0.3, "ekdum": 0.4, "bilkul": 0.3, "thoda": -0.3,
+    "बहुत": 0.3, "एकदम": 0.4, "बिल्कुल": 0.3, "थोड़ा": -0.3,
+}
+
+# Polarity above/below these thresholds counts as positive/negative
+POSITIVE_THRESHOLD = 0.05
+NEGATIVE_THRESHOLD = -0.05
+
+# Devanagari vowel signs are combining marks, which \w does not match on its own
+TOKEN_PATTERN = re.compile(r"[\w\u0900-\u097F']+")
+
+# Everything TOKEN_PATTERN does not match, except whitespace and the batch separator
+NON_TOKEN_PATTERN = re.compile(r"[^\w\u0900-\u097F'\s\x00]+")
+COMMENT_SEPARATOR = "\x00"
+
+def tokenize(text):
+    return TOKEN_PATTERN.findall(text.lower())
+
+# ─── Vocabulary ───────────────────────────────────────────────────────────────
+Vocabulary = namedtuple("Vocabulary", "index scores negates trails boosts")
+
+def compile_vocabulary(lexicon, negations, trailing_negations, intensifiers):
+    """Token → ID map plus score, negator and boost arrays indexed by ID; ID 0 is out-of-vocabulary"""
+    tokens = sorted(set(lexicon) | set(negations) | set(trailing_negations) | set(intensifiers))
+    index = {token: i for i, token in enumerate(tokens, start=1)}
+    scores = np.zeros(len(tokens) + 1)
+    negates = np.zeros(len(tokens) + 1, dtype=bool)
+    trails = np.zeros(len(tokens) + 1, dtype=bool)
+    boosts = np.zeros(len(tokens) + 1)
+    for token, i in index.items():
+        scores[i] = lexicon.get(token, 0.0)
+        negates[i] = token in negations
+        trails[i] = token in trailing_negations
+        boosts[i] = intensifiers.get(token, 0.0)
+    return Vocabulary(index, scores, negates, trails, boosts)
+
+VOCABULARY = compile_vocabulary(LEXICON, NEGATIONS, TRAILING_NEGATIONS, INTENSIFIERS)
+
+# ─── Scoring ──────────────────────────────────────────────────────────────────
+# Comments scored per batch; bounds the token arrays for videos with 500k+ comments
+SCORING_BATCH_SIZE = 100_000
+
+def token_ids(comments, index):
+    """Flat vocabulary IDs for a batch of comments, plus the token count of each comment.
+
+    The batch is tokenized as one string: punctuation becomes whitespace and a
+    standalone NUL separates comments, so a single split() matches what
+    TOKEN_PATTERN would find per comment.
+    """
+    text = f" {COMMENT_SEPARATOR} ".join(comments)
+    if text.count(COMMENT_SEPARATOR) != len(comments) - 1:
+        text = f" {COMMENT_SEPARATOR} ".join(c.replace(COMMENT_SEPARATOR, " ") for c in comments)
+    tokens = NON_TOKEN_PATTERN.sub(" ", text.lower()).split()
+
+    lookup = {**index, COMMENT_SEPARATOR: -1}
+    ids = np.fromiter(map(lookup.get, tokens, repeat(0)), dtype=np.int32, count=len(tokens))
+    separators = np.flatnonzero(ids == -1)
+    lengths = np.diff(np.concatenate(([-1], separators, [len(ids)]))) - 1
+    return np.delete(ids, separators), lengths
+
+def _score_batch(comments, vocab):
+    ids, lengths = token_ids(comments, vocab.index)
+    hits = np.flatnonzero(vocab.scores[ids])
+    if not len(hits):
+        return np.zeros(len(comments))
+
+    # Owning comment and in-comment position of each hit, so modifiers never reach across comments
+    ends = np.cumsum(lengths)
+    owner = np.searchsorted(ends, hits, side="right")
+    position = hits - (ends - lengths)[owner]
+
+    negated = np.zeros(len(hits), dtype=bool)
+    for k in range(1, NEGATION_SCOPE + 1):
+        negated |= (position >= k) & vocab.negates[ids[np.maximum(hits - k, 0)]]
+    negated |= (hits + 1 < ends[owner]) & vocab.trails[ids[np.minimum(hits + 1, len(ids) - 1)]]
+    boost = np.where(position >= 1, vocab.boosts[ids[np.maximum(hits - 1, 0)]], 0.0)
+
+    weights = vocab.scores[ids[hits]] * (1.0 + boost) * np.where(negated, NEGATION_FACTOR, 1.0)
+    sums = np.bincount(owner, weights=weights, minlength=len(comments))
+    counts = np.bincount(owner, minlength=len(comments))
+    return np.clip(sums / np.maximum(counts, 1), -1.0, 1.0)
+
+def score_comments(comments, vocab=VOCABULARY, batch_size=SCORING_BATCH_SIZE):
+    """Polarity in [-1, 1] per comment: mean of its (negated/intensified) lexicon hits, 0 without hits"""
+    if not len(comments):
+        return np.zeros(0)
+    return np.concatenate([
+        _score_batch(comments[start:start + batch_size], vocab)
+        for start in range(0, len(comments), batch_size)
+    ])
+
+def classify(scores):
+    """Positive, negative and neutral counts for an array of polarities"""
+    positive = int(np.count_nonzero(scores > POSITIVE_THRESHOLD))
+    negative = int(np.count_nonzero(scores < NEGATIVE_THRESHOLD))
+    return positive, negative, len(scores) - positive - negative
+
+# ─── Running Aggregates ───────────────────────────────────────────────────────
+# Equal-width score bins over [-1, 1] for the streamed distribution
+HISTOGRAM_BINS = 20
+# Per-batch points kept for the "as comments arrive" trend
+HISTORY_LIMIT = 500
+
+class RunningAggregate:
+    """Counts, score sum, histogram and top examples, folded in one batch at a time.
+
+    ``to_dict``/``from_dict`` give the JSON form the pipeline writes as its
+    partial result; only ``total``, ``positive``, ``negative`` and
+    ``score_sum`` are required there.
+    """
+
+    def __init__(self, examples=3):
+        self.examples = examples
+        self.total = 0
+        self.positive = 0
+        self.negative = 0
+        self.score_sum = 0.0
+        self.histogram = np.zeros(HISTOGRAM_BINS, dtype=np.int64)
+        # (comments so far, positive, negative, neutral) per batch
+        self.history = []
+        self.most_positive = []
+        self.most_negative = []
+        self.updated_at = time.time()
+
+    @property
+    def neutral(self):
+        return self.total - self.positive - self.negative
+
+    @property
+    def mean(self):
+        return self.score_sum / self.total if self.total else 0.0
+
+    def add(self, comments, scores):
+        if not len(scores):
+            return
+        positive, negative, neutral = classify(scores)
+        self.total += len(scores)
+        self.positive += positive
+        self.negative += negative
+        self.score_sum += float(scores.sum())
+        self.histogram += np.histogram(scores, bins=len(self.histogram), range=(-1.0, 1.0))[0]
+        self.history.append((self.total, positive, negative, neutral))
+        del self.history[:-HISTORY_LIMIT]
+
+        k = min(self.examples, len(scores))
+        top = np.argpartition(scores, -k)[-k:]
+        bottom = np.argpartition(scores, k - 1)[:k]
+        self.most_positive = sorted(
+            self.most_positive + [(float(scores[i]), comments[i][:200]) for i in top if scores[i] > 0],
+            key=lambda example: -example[0],
+        )[:self.examples]
+        self.most_negative = sorted(
+            self.most_negative + [(float(scores[i]), comments[i][:200]) for i in bottom if scores[i] < 0],
+            key=lambda example: example[0],
+        )[:self.examples]
+        self.updated_at = time.time()
+
+    def summary(self, video_id, new_comments=None):
+        """Text summary in the format the Dataflow pipeline writes.
+
+        `new_comments` is set for incremental runs and noted in the summary.
+        """
+        lines = [
+            f"Sentiment summary for video {video_id}",
+            f"Total comments: {self.total}",
+            f"Avg sentiment score: {self.mean:.4f}",
+            f"Positive comments: {self.positive}, Negative comments: {self.negative}, Neutral comments: {self.neutral}",
+        ]
+        if new_comments is not None:
+            lines.append(f"Incremental update: {new_comments} new comments scored since the previous run")
+        if self.total:
+            lines.append("")
+            lines.append("Most positive comments")
+            lines.extend(f"- ({score:+.2f}) {text}" for score, text in self.most_positive)
+            lines.append("")
+            lines.append("Most negative comments")
+            lines.extend(f"- ({score:+.2f}) {text}" for score, text in self.most_negative)
+        return "\n".join(lines)
+
+    def to_dict(self):
+        return {
+            "total": self.total,
+            "positive": self.positive,
+            "negative": self.negative,
+            "score_sum": self.score_sum,
+            "histogram": self.histogram.tolist(),
+            "history": self.history,
+            "most_positive": self.most_positive,
+            "most_negative": self.most_negative,
+            "updated_at": self.updated_at,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        aggregate = cls()
+        aggregate.total = int(data["total"])
+        aggregate.positive = int(data["positive"])
+        aggregate.negative = int(data["negative"])
+        aggregate.score_sum = float(data["score_sum"])
+        if data.get("histogram"):
+            aggregate.histogram = np.asarray(data["histogram"], dtype=np.int64)
+        aggregate.history = [tuple(point) for point in data.get("history", [])]
+        aggregate.most_positive = [tuple(example) for example in data.get("most_positive", [])]
+        aggregate.most_negative = [tuple(example) for example in data.get("most_negative", [])]
+        aggregate.updated_at = float(data.get("updated_at", 0))
+        return aggregate
+
+# ─── Result Schema ────────────────────────────────────────────────────────────
+# Structured results are JSON objects tagged with this schema name and a version:
+#   {"schema": "youtube-sentiment-result", "version": 1, "video_id": ...,
+#    "total_comments": N, "avg_sentiment": x,
+#    "counts": {"positive": P, "negative": N, "neutral": U},
+#    "histogram": [...] (optional), "summary": "<text summary>",
+#    "comments_table": "<object name of a per-comment Parquet table>" (optional)}
+RESULT_SCHEMA = "youtube-sentiment-result"
+RESULT_SCHEMA_VERSION = 1
+
+SentimentResult = namedtuple("SentimentResult", [
+    "schema_version",  # 0 for a legacy text summary
+    "video_id",
+    "total_comments",
+    "avg_sentiment",
+    "positive",
+    "negative",
+    "neutral",
+    "histogram",       # list of counts over [-1, 1], or None
+    "summary",         # text summary, as used for the AI prompt and downloads
+    "comments_table",  # per-comment table object name, or None
+    "warnings",        # list of strings the dashboard shows next to the metrics
+])
+
+class ResultSchemaError(ValueError):
+    """Result content that cannot be turned into a SentimentResult"""
+
+def result_document(video_id, aggregate, summary, comments_table=None):
+    """Structured result for a finished aggregate, as a JSON string"""
+    document = {
+        "schema": RESULT_SCHEMA,
+        "version": RESULT_SCHEMA_VERSION,
+        "video_id": video_id,
+        "total_comments": aggregate.total,
+        "avg_sentiment": aggregate.mean,
+        "counts": {"positive": aggregate.positive, "negative": aggregate.negative, "neutral": aggregate.neutral},
+        "histogram": aggregate.histogram.tolist(),
+        "summary": summary,
+    }
+    if comments_table:
+        document["comments_table"] = comments_table
+    return json.dumps(document, ensure_ascii=False)
+
+def parse_result(content):
+    """SentimentResult from structured JSON or, with warnings, a legacy text summary"""
+    if content.lstrip().startswith("{"):
+        return _parse_result_document(content)
+    return _parse_legacy_summary(content)
+
+def _parse_result_document(content):
+    try:
+        document = json.loads(content)
+    except ValueError as e:
+        raise ResultSchemaError(f"Result is not valid JSON: {e}") from e
+    if document.get("schema") != RESULT_SCHEMA:
+        raise ResultSchemaError(f"Unknown result schema: {document.get('schema')!r}")
+    if document.get("version") != RESULT_SCHEMA_VERSION:
+        raise ResultSchemaError(
+            f"Unsupported result schema version {document.get('version')!r}; this dashboard reads version {RESULT_SCHEMA_VERSION}"
+        )
+    
+    try:
+        counts = document["counts"]
+        result = SentimentResult(
+            schema_version=document["version"],
+            video_id=document.get("video_id"),
+            total_comments=int(document["total_comments"]),
+            avg_sentiment=float(document["avg_sentiment"]),
+            positive=int(counts["positive"]),
+            negative=int(counts["negative"]),
+            neutral=int(counts["neutral"]),
+            histogram=document.get("histogram"),
+            summary=str(document["summary"]),
+            comments_table=document.get("comments_table"),
+            warnings=[],
+        )
+    except (KeyError, TypeError, ValueError) as e:
+        raise ResultSchemaError(f"Result is missing or has a malformed field: {e}") from e
+    return _check_counts(result)
+
+# Labels of the legacy text summary; each is matched on its own, in any order
+LEGACY_FIELDS = {
+    "total_comments": re.compile(r"^\s*Total comments:\s*(\d+)", re.MULTILINE),
+    "avg_sentiment": re.compile(r"^\s*Avg sentiment score:\s*(-?\d+(?:\.\d+)?)", re.MULTILINE),
+    "positive": re.compile(r"\bPositive comments:\s*(\d+)"),
+    "negative": re.compile(r"\bNegative comments:\s*(\d+)"),
+    "neutral": re.compile(r"\bNeutral comments:\s*(\d+)"),
+}
+
+# Older summaries put all three counts on the "Positive comments" line with
+# other wording; as before, its first three numbers are positive, negative, neutral
+LEGACY_COUNTS_LINE = re.compile(r"^\s*Positive comments:(.*)$", re.MULTILINE)
+LEGACY_COUNTS = ("positive", "negative", "neutral")
+
+def _parse_legacy_summary(content):
+    values = {}
+    for field, pattern in LEGACY_FIELDS.items():
+        match = pattern.search(content)
+        if match:
+            values[field] = match.group(1)
+    if not all(field in values for field in LEGACY_COUNTS):
+        line = LEGACY_COUNTS_LINE.search(content)
+        numbers = re.findall(r"\d+", line.group(1)) if line else []
+        if len(numbers) >= 3:
+            values.update(zip(LEGACY_COUNTS, numbers))
+    missing = [field for field in LEGACY_FIELDS if field not in values]
+    if missing:
+        raise ResultSchemaError(f"Text summary is missing {', '.join(missing)}; its wording may have changed")
+    
+    result = SentimentResult(
+        schema_version=0,
+        video_id=None,
+        total_comments=int(values["total_comments"]),
+        avg_sentiment=float(values["avg_sentiment"]),
+        positive=int(values["positive"]),
+        negative=int(values["negative"]),
+        neutral=int(values["neutral"]),
+        histogram=None,
+        summary=content,
+        comments_table=None,
+        warnings=["Legacy text result: metrics were read from the summary wording, not a structured result."],
+    )
+    return _check_counts(result)
+
+def _check_counts(result):
+    counted = result.positive + result.negative + result.neutral
+    if counted != result.total_comments:
+        result.warnings.append(
+            f"Sentiment counts add up to {counted}, but the result reports {result.total_comments} comments."
+        )
+    return result
+
+# ─── Progress Records ─────────────────────────────────────────────────────────
+# What a running job reports about itself, overwritten as it goes:
+#   {"stage": "fetching" | "scoring" | "writing", "comments_fetched": F,
+#    "comments_scored": S, "comments_expected": E (optional),
+#    "incremental": true (optional; only comments since an earlier run are fetched),
+#    "started_at": <epoch seconds>, "updated_at": <epoch seconds>}
+PROGRESS_STAGES = ("fetching", "scoring", "writing")
+
+Progress = namedtuple("Progress", [
+    "stage",
+    "comments_fetched",
+    "comments_scored",
+    "comments_expected",  # None when the job doesn't know how many it will get
+    "started_at",
+    "updated_at",
+    "incremental",  # the video's comment count says nothing about the job's size
+])
+
+def progress_record(stage, comments_fetched, comments_scored, started_at, comments_expected=None, updated_at=None,
+                    incremental=False):
+    """Progress record dict, ready to be written as JSON"""
+    record = {
+        "stage": stage,
+        "comments_fetched": comments_fetched,
+        "comments_scored": comments_scored,
+        "started_at": started_at,
+        "updated_at": updated_at or time.time(),
+    }
+    if comments_expected is not None:
+        record["comments_expected"] = comments_expected
+    if incremental:
+        record["incremental"] = True
+    return record
+
+def parse_progress(record):
+    """Progress from a progress record dict, or None if it isn't a valid one"""
+    try:
+        if record["stage"] not in PROGRESS_STAGES:
+            return None
+        expected = record.get("comments_expected")
+        return Progress(
+            stage=record["stage"],
+            comments_fetched=int(record["comments_fetched"]),
+            comments_scored=int(record["comments_scored"]),
+            comments_expected=int(expected) if expected is not None else None,
+            started_at=float(record["started_at"]),
+            updated_at=float(record["updated_at"]),
+            incremental=bool(record.get("incremental", False)),
+        )
+    except (KeyError, TypeError, ValueError):
+        return None
+
+def scoring_rate(samples):
+    """Comments scored per second across Progress snapshots of one job, oldest first
+
+    Uses the change between the first and last snapshot, or the whole run so
+    far when there is only one; None until anything has been scored.
+    """
+    if not samples:
+        return None
+    first, last = samples[0], samples[-1]
+    if last.updated_at > first.updated_at and last.comments_scored > first.comments_scored:
+        return (last.comments_scored - first.comments_scored) / (last.updated_at - first.updated_at)
+    elapsed = last.updated_at - last.started_at
+    if elapsed > 0 and last.comments_scored:
+        return last.comments_scored / elapsed
+    return None
+
+# ─── Comment Sources ──────────────────────────────────────────────────────────
+# Comments per page when streaming a fixture; API pages hold at most 100
+FIXTURE_PAGE_SIZE = 1000
+
+# published_at is an RFC 3339 UTC string as the API returns it, so strings order by time
+Comment = namedtuple("Comment", ["id", "text", "published_at"])
+
+def load_fixture_comments(fixture_dir, video_id):
+    """Comments from <fixture_dir>/<video_id>.json or .txt (one per line), newest first.
+
+    JSON items are strings or {"text", "id", "published_at"} objects; only
+    fixtures with timestamps support incremental runs.
+    """
+    json_path = os.path.join(fixture_dir, f"{video_id}.json")
+    if os.path.exists(json_path):
+        with open(json_path, encoding="utf-8") as f:
+            items = json.load(f)
+        comments = [
+            Comment(item.get("id"), item["text"], item.get("published_at")) if isinstance(item, dict)
+            else Comment(None, str(item), None)
+            for item in items
+        ]
+        if all(comment.published_at for comment in comments):
+            comments.sort(key=lambda comment: comment.published_at, reverse=True)
+        return comments
+
+    with open(os.path.join(fixture_dir, f"{video_id}.txt"), encoding="utf-8") as f:
+        return [Comment(None, line.rstrip("\n"), None) for line in f if line.strip()]
+
+def iter_api_comment_pages(video_id, api_key, max_comments):
+    """Pages of top-level comments from commentThreads.list, newest first"""
+    from googleapiclient.discovery import build
+
+    youtube = build("youtube", "v3", developerKey=api_key, static_discovery=True, cache_discovery=False)
+    fetched = 0
+    page_token = None
+    while fetched < max_comments:
+        resp = youtube.commentThreads().list(
+            part="snippet", videoId=video_id, maxResults=100, order="time",
+            textFormat="plainText", pageToken=page_token,
+        ).execute(num_retries=2)
+        page = []
+        for item in resp.get("items", []):
+            snippet = item["snippet"]["topLevelComment"]["snippet"]
+            page.append(Comment(item["snippet"]["topLevelComment"]["id"], snippet["textDisplay"], snippet["publishedAt"]))
+        page = page[:max_comments - fetched]
+        fetched += len(page)
+        if page:
+            yield page
+        page_token = resp.get("nextPageToken")
+        if not page_token:
+            break
+
+class CheckpointUnreachable(Exception):
+    """More comments arrived since a checkpoint than one run may fetch"""
+
+def iter_comment_pages(video_id, api_key=None, fixture_dir=None, max_comments=20000, checkpoint=None):
+    """Pages of Comments, newest first, from a fixture when fixture_dir is set, else from the API.
+
+    With a checkpoint, only comments newer than it are returned and fetching
+    stops at the first page that reaches it. Raises CheckpointUnreachable when
+    max_comments new comments are fetched without reaching it: merging them
+    would skip the comments between, so the caller must run in full instead.
+    """
+    if fixture_dir:
+        comments = load_fixture_comments(fixture_dir, video_id)
+        source = (comments[start:start + FIXTURE_PAGE_SIZE] for start in range(0, len(comments), FIXTURE_PAGE_SIZE))
+    else:
+        source = iter_api_comment_pages(video_id, api_key, max_comments)
+
+    fetched = 0
+    for page in source:
+        fresh = [comment for comment in page if is_after_checkpoint(comment, checkpoint)] if checkpoint else page
+        reached = len(fresh) < len(page)
+        fresh = fresh[:max_comments - fetched]
+        fetched += len(fresh)
+        if checkpoint and not reached and fetched >= max_comments:
+            raise CheckpointUnreachable(f"over {max_comments} new comments since the checkpoint")
+        if fresh:
+            yield fresh
+        if reached or fetched >= max_comments:
+            return
+
+# ─── Checkpoints ──────────────────────────────────────────────────────────────
+def is_after_checkpoint(comment, checkpoint):
+    """Whether a comment is newer than everything a checkpoint covers"""
+    if comment.published_at != checkpoint["last_comment_at"]:
+        return comment.published_at > checkpoint["last_comment_at"]
+    # Same second as the checkpoint: only comments it has not counted
+    return comment.id not in checkpoint["boundary_ids"]
+
+def make_checkpoint(aggregate, newest_page, previous=None, started_at=None):
+    """Checkpoint after a run: its aggregate plus the newest comment it saw.
+
+    `newest_page` is the run's first page (newest comments first); without
+    one, the previous checkpoint's position is kept. ``full_scan_at`` is when
+    the full scan the aggregate builds on started: `started_at` for a run
+    without a previous checkpoint, carried forward from it otherwise. Returns
+    None when the comments carry no timestamps to resume from.
+    """
+    if newest_page:
+        last_comment_at = newest_page[0].published_at
+        if last_comment_at is None:
+            return None
+        boundary_ids = [comment.id for comment in newest_page if comment.published_at == last_comment_at]
+        if previous and previous["last_comment_at"] == last_comment_at:
+            boundary_ids = sorted(set(boundary_ids) | set(previous["boundary_ids"]))
+        last_comment_id = newest_page[0].id
+    elif previous:
+        last_comment_at = previous["last_comment_at"]
+        last_comment_id = previous["last_comment_id"]
+        boundary_ids = previous["boundary_ids"]
+    else:
+        return None
+    return {
+        "aggregate": aggregate.to_dict(),
+        "full_scan_at": previous["full_scan_at"] if previous else (started_at or time.time()),
+        "last_comment_id": last_comment_id,
+        "last_comment_at": last_comment_at,
+        "boundary_ids": boundary_ids,
+    }